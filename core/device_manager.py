@@ -1,8 +1,14 @@
 """Manages device connections, interactions, and persistence via SQLite."""
 
 import asyncio
+import atexit
+import inspect
 import logging
+import socket
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 # iOS Imports
@@ -12,7 +18,15 @@ from pymobiledevice3.remote.remote_service_discovery import RemoteServiceDiscove
 from pymobiledevice3.services.dvt.dvt_secure_socket_proxy import DvtSecureSocketProxyService
 from pymobiledevice3.services.dvt.instruments.location_simulation import LocationSimulation
 from pymobiledevice3.services.simulate_location import DtSimulateLocation
-from pymobiledevice3.usbmux import list_devices as list_ios_devices
+from pymobiledevice3.usbmux import create_mux, list_devices as list_ios_devices
+
+try:
+    # pylint: disable=protected-access
+    from pymobiledevice3.tunneld.api import _list_tunnels
+    TUNNELD_AVAILABLE = True
+except ImportError:
+    _list_tunnels = None
+    TUNNELD_AVAILABLE = False
 
 # Android Imports
 try:
@@ -31,29 +45,160 @@ from core.exceptions import (
 logger = logging.getLogger(__name__)
 
 DB_PATH = "devices.db"
+# Seconds before re-probing an adb-server that was found offline
+ADB_RETRY_INTERVAL = 30.0
+# Seconds before re-subscribing to usbmuxd after the event socket drops
+USBMUX_RETRY_INTERVAL = 5.0
+# pymobiledevice3 8+ made the usbmux API async; the watcher needs the sync one
+USBMUX_EVENTS_SUPPORTED = not inspect.iscoroutinefunction(create_mux)
+# Seconds between forced WAL checkpoints (see DevicePool.wal_maintenance_loop)
+WAL_CHECKPOINT_INTERVAL = 300.0
 # Intent constants for Fake GPS location (com.lexa.fakegps)
 ANDROID_INTENT_ACTION = "com.lexa.fakegps.START"
+# Fixed part of the location command; only lat/long are formatted per update.
+# Using --ed (double) for precision
+ANDROID_LOCATION_CMD_PREFIX = f"am startservice -a {ANDROID_INTENT_ACTION} --ed lat "
+# Printed after each persistent-shell command to mark its completion. The
+# command echoes it with an empty quote inside, so a TTY echo of the typed
+# line never contains the marker itself.
+ANDROID_SHELL_DONE = b"__OMNI_DONE__"
+ANDROID_SHELL_DONE_CMD = '; echo __OMNI_""DONE__\n'
+# Seconds to wait for a persistent-shell command to complete
+ANDROID_SHELL_TIMEOUT = 5.0
+
+# Hot-path statements are kept as constants so sqlite3's per-connection
+# statement cache reuses the compiled form instead of re-parsing the SQL.
+SQL_SELECT_DEVICE = "SELECT real_name, custom_name FROM devices WHERE udid = ? LIMIT 1"
+# COALESCE keeps the stored value for columns passed as None
+SQL_UPSERT_DEVICE = """
+    INSERT INTO devices (udid, real_name, custom_name) VALUES (?, ?, ?)
+    ON CONFLICT(udid) DO UPDATE SET
+        real_name = COALESCE(excluded.real_name, devices.real_name),
+        custom_name = COALESCE(excluded.custom_name, devices.custom_name),
+        last_seen = CAST(strftime('%s', 'now') AS INTEGER)
+"""
+
+
+# last_seen is stored as integer Unix time
+_SQL_CREATE_DEVICES = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        udid TEXT PRIMARY KEY,
+        real_name TEXT,
+        custom_name TEXT,
+        last_seen INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+        service_kind TEXT
+    )
+"""
+SQL_SELECT_SERVICE_KIND = "SELECT service_kind FROM devices WHERE udid = ? LIMIT 1"
+SQL_UPSERT_SERVICE_KIND = """
+    INSERT INTO devices (udid, service_kind) VALUES (?, ?)
+    ON CONFLICT(udid) DO UPDATE SET service_kind = excluded.service_kind
+"""
+
+# Location service kinds remembered per iOS device
+SERVICE_KIND_LEGACY = "legacy"  # DtSimulateLocation (iOS < 17)
+SERVICE_KIND_DVT = "dvt"  # DVT LocationSimulation
+
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.Lock()
+_db_initialized = False
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Returns the shared SQLite connection, opening it on first use.
+
+    The connection is shared between the event loop and executor threads,
+    so callers must hold ``_conn_lock`` while using it. Per-connection
+    PRAGMAs are applied here, once, when the connection is opened.
+
+    Returns:
+        The cached sqlite3.Connection.
+    """
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        # The database is tiny; serve reads from mmap and a 2 MiB page cache
+        conn.execute("PRAGMA mmap_size=67108864")
+        conn.execute("PRAGMA cache_size=-2000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Checkpoint automatically once the WAL reaches ~1000 pages
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        _conn = conn
+    return _conn
+
+
+@atexit.register
+def _close_conn() -> None:
+    """Closes the shared SQLite connection at interpreter exit."""
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+def _migrate_last_seen(conn: sqlite3.Connection) -> None:
+    """Converts a legacy TEXT ``last_seen`` column to integer Unix time.
+
+    Older databases stored ``CURRENT_TIMESTAMP`` strings. SQLite cannot
+    alter a column type in place, so the table is rebuilt once.
+
+    Args:
+        conn: Connection inside an open transaction.
+    """
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(devices)")}
+    if columns.get("last_seen", "").upper() == "INTEGER":
+        return
+
+    logger.info("Migrating devices.last_seen to integer Unix time")
+    conn.execute("DROP TABLE IF EXISTS devices_new")
+    conn.execute(_SQL_CREATE_DEVICES.format(table="devices_new"))
+    conn.execute(
+        """
+        INSERT INTO devices_new (udid, real_name, custom_name, last_seen)
+        SELECT udid, real_name, custom_name, CAST(strftime('%s', last_seen) AS INTEGER)
+        FROM devices
+        """
+    )
+    conn.execute("DROP TABLE devices")
+    conn.execute("ALTER TABLE devices_new RENAME TO devices")
+
+
+def _migrate_service_kind(conn: sqlite3.Connection) -> None:
+    """Adds the ``service_kind`` column to databases created before it existed.
+
+    Args:
+        conn: Connection inside an open transaction.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(devices)")}
+    if "service_kind" not in columns:
+        conn.execute("ALTER TABLE devices ADD COLUMN service_kind TEXT")
 
 
 def init_db() -> None:
     """Initializes the SQLite database table if it does not exist.
+
+    Runs once per process; later calls return immediately.
     
     Raises:
         DatabaseError: If database initialization fails.
     """
+    global _db_initialized
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS devices (
-                    udid TEXT PRIMARY KEY,
-                    real_name TEXT,
-                    custom_name TEXT,
-                    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            conn.commit()
+        with _conn_lock:
+            if _db_initialized:
+                return
+            conn = _get_conn()
+            with conn:
+                conn.execute(_SQL_CREATE_DEVICES.format(table="devices"))
+                _migrate_last_seen(conn)
+                _migrate_service_kind(conn)
+            # WAL keeps commits append-only so scans are not blocked by writes.
+            # journal_mode is persistent in the file, unlike the PRAGMAs in _get_conn.
+            conn.execute("PRAGMA journal_mode=WAL")
+            _db_initialized = True
     except sqlite3.Error as e:
         logger.error("Failed to initialize database: %s", e)
         raise DatabaseError("initialization", str(e))
@@ -70,10 +215,8 @@ def get_device_info_from_db(udid: str) -> Tuple[Optional[str], Optional[str]]:
         Values can be None if not found.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.execute(
-                "SELECT real_name, custom_name FROM devices WHERE udid = ?", (udid,)
-            )
+        with _conn_lock:
+            cursor = _get_conn().execute(SQL_SELECT_DEVICE, (udid,))
             row = cursor.fetchone()
             if row:
                 return row[0], row[1]
@@ -82,6 +225,86 @@ def get_device_info_from_db(udid: str) -> Tuple[Optional[str], Optional[str]]:
     return None, None
 
 
+def get_service_kind_from_db(udid: str) -> Optional[str]:
+    """Retrieves the location service kind that last worked for a device.
+
+    Args:
+        udid: The Unique Device Identifier.
+
+    Returns:
+        SERVICE_KIND_LEGACY, SERVICE_KIND_DVT, or None if unknown.
+    """
+    try:
+        with _conn_lock:
+            row = _get_conn().execute(SQL_SELECT_SERVICE_KIND, (udid,)).fetchone()
+            if row:
+                return row[0]
+    except sqlite3.Error as e:
+        logger.error("Database error retrieving service kind for %s: %s", udid, e)
+    return None
+
+
+def update_service_kind_in_db(udid: str, service_kind: str) -> None:
+    """Stores the location service kind that worked for a device.
+
+    Failures are logged only; the value is an optimization hint.
+
+    Args:
+        udid: The Unique Device Identifier.
+        service_kind: SERVICE_KIND_LEGACY or SERVICE_KIND_DVT.
+    """
+    try:
+        with _conn_lock:
+            conn = _get_conn()
+            with conn:
+                conn.execute(SQL_UPSERT_SERVICE_KIND, (udid, service_kind))
+    except sqlite3.Error as e:
+        logger.error("Database error updating service kind for %s: %s", udid, e)
+
+
+def checkpoint_wal() -> None:
+    """Copies the WAL back into the database file and truncates it.
+
+    Auto-checkpoints can be starved while readers are active, letting
+    devices.db-wal grow during long sessions; a periodic TRUNCATE bounds it.
+    Failures are logged only.
+    """
+    try:
+        with _conn_lock:
+            busy, _, _ = _get_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            logger.debug("WAL checkpoint could not complete; database busy")
+    except sqlite3.Error as e:
+        logger.warning("WAL checkpoint failed: %s", e)
+
+
+def get_devices_info_from_db(
+    udids: List[str],
+) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Retrieves real_name and custom_name for several devices in one query.
+
+    Args:
+        udids: The Unique Device Identifiers to look up.
+
+    Returns:
+        A dict mapping udid to (real_name, custom_name).
+        Devices without a stored record are omitted.
+    """
+    if not udids:
+        return {}
+    placeholders = ",".join("?" * len(udids))
+    try:
+        with _conn_lock:
+            cursor = _get_conn().execute(
+                f"SELECT udid, real_name, custom_name FROM devices WHERE udid IN ({placeholders})",
+                udids,
+            )
+            return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    except sqlite3.Error as e:
+        logger.error("Database error retrieving info for %d devices: %s", len(udids), e)
+    return {}
+
+
 def update_device_info_in_db(
     udid: str, real_name: Optional[str] = None, custom_name: Optional[str] = None
 ) -> None:
@@ -96,33 +319,161 @@ def update_device_info_in_db(
         DatabaseError: If database update fails.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            # Check if record exists
-            cursor = conn.execute("SELECT 1 FROM devices WHERE udid = ?", (udid,))
-            exists = cursor.fetchone()
-
-            if exists:
-                if real_name is not None:
-                    conn.execute(
-                        "UPDATE devices SET real_name = ?, last_seen = CURRENT_TIMESTAMP WHERE udid = ?",
-                        (real_name, udid),
-                    )
-                if custom_name is not None:
-                    conn.execute(
-                        "UPDATE devices SET custom_name = ?, last_seen = CURRENT_TIMESTAMP WHERE udid = ?",
-                        (custom_name, udid),
-                    )
-            else:
-                conn.execute(
-                    "INSERT INTO devices (udid, real_name, custom_name) VALUES (?, ?, ?)",
-                    (udid, real_name, custom_name),
-                )
-            conn.commit()
+        with _conn_lock:
+            conn = _get_conn()
+            with conn:
+                conn.execute(SQL_UPSERT_DEVICE, (udid, real_name, custom_name))
     except sqlite3.Error as e:
         logger.error("Database error updating info for %s: %s", udid, e)
         raise DatabaseError("update", str(e))
 
 
+class _DBBatch:
+    """Buffers device rows so they are written in a single transaction.
+
+    Attributes:
+        rows: Pending (udid, real_name, custom_name) tuples. None columns
+            keep their stored value, as in update_device_info_in_db.
+    """
+
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+    def append(
+        self, udid: str, real_name: Optional[str] = None, custom_name: Optional[str] = None
+    ) -> None:
+        """Queues a device row for the next flush."""
+        self.rows.append((udid, real_name, custom_name))
+
+    def flush(self) -> None:
+        """Writes all queued rows with one executemany and one commit.
+
+        Raises:
+            DatabaseError: If the batched write fails. Queued rows are dropped.
+        """
+        if not self.rows:
+            return
+        try:
+            with _conn_lock:
+                conn = _get_conn()
+                with conn:
+                    conn.executemany(SQL_UPSERT_DEVICE, self.rows)
+        except sqlite3.Error as e:
+            logger.error("Database error writing %d device rows: %s", len(self.rows), e)
+            raise DatabaseError("batch update", str(e))
+        finally:
+            self.rows.clear()
+
+
+def _receive_usbmux_event(mux: Any) -> bool:
+    """Blocks until usbmuxd reports an Attached/Detached/Paired event.
+
+    Uses the private MuxConnection._receive of the synchronous
+    pymobiledevice3 7.x API pinned in requirements.txt. The public
+    receive_device_state_update raises on Paired messages, which would
+    drop the subscription.
+
+    Args:
+        mux: A listening usbmux connection.
+
+    Returns:
+        False if this pymobiledevice3 offers no synchronous _receive, in
+        which case the caller must fall back to re-listing on every scan.
+    """
+    receive = getattr(mux, "_receive", None)
+    if receive is None or inspect.iscoroutinefunction(receive):
+        return False
+    receive()
+    return True
+
+
+class _UsbmuxWatcher:
+    """Watches usbmuxd attach/detach events on a daemon thread.
+
+    Listing devices costs a usbmuxd round trip (plus a 100 ms wait on the
+    binary protocol), so scans only re-list after the watcher has seen an
+    event. While no event subscription is live, every scan re-lists.
+    """
+
+    __slots__ = ("_changed", "_listening", "_thread")
+
+    def __init__(self) -> None:
+        self._changed = threading.Event()
+        self._changed.set()
+        self._listening = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the watcher thread if it is not running yet.
+
+        Without the synchronous usbmux API there is nothing to watch, and
+        every scan re-lists.
+        """
+        if self._thread is None and USBMUX_EVENTS_SUPPORTED:
+            self._thread = threading.Thread(
+                target=self._run, name="usbmux-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def consume_change(self) -> bool:
+        """Returns True if the device list must be re-read, and resets the flag.
+
+        The flag is cleared before the caller lists devices, so an event
+        arriving during the listing marks the next scan as changed again.
+        It is only cleared when it was set; an event arriving between the
+        check and the clear is therefore never lost.
+        """
+        if not self._listening:
+            return True
+        if not self._changed.is_set():
+            return False
+        self._changed.clear()
+        return True
+
+    def mark_changed(self) -> None:
+        """Forces the next scan to re-read the device list."""
+        self._changed.set()
+
+    def _run(self) -> None:
+        while True:
+            mux = None
+            try:
+                mux = create_mux()
+                mux.listen()
+                self._listening = True
+                while _receive_usbmux_event(mux):
+                    self._changed.set()
+                logger.info("usbmuxd events unsupported; re-listing devices on every scan")
+                return
+            except Exception as e:
+                logger.debug("usbmuxd event subscription lost: %s", e)
+            finally:
+                self._listening = False
+                self._changed.set()
+                if mux is not None:
+                    try:
+                        mux.close()
+                    except OSError:
+                        pass
+            time.sleep(USBMUX_RETRY_INTERVAL)
+
+
+def fetch_android_model(device: Any) -> str:
+    """Reads the product model of an ADB device.
+
+    Queries the single property instead of pulling the full getprop dump.
+
+    Args:
+        device: A ppadb Device instance.
+
+    Returns:
+        The ro.product.model value, or "Unknown" if it is empty.
+    """
+    return device.shell("getprop ro.product.model").strip() or "Unknown"
+
+
 class BaseDevice:
     """Abstract base class representing a generic mobile device.
 
@@ -132,29 +483,76 @@ class BaseDevice:
         connection_type: Type of connection ('usb', 'wifi', 'adb', or 'unknown').
         real_name: Name retrieved from the device hardware.
         custom_name: Name assigned by the user.
+        device_type: Platform label shown in the UI; set per subclass.
     """
 
-    def __init__(self, udid: str, name: str = "Unknown") -> None:
-        """Initializes the BaseDevice and loads persisted names."""
+    device_type = "unknown"
+
+    # Subclasses declare only their additional attributes
+    __slots__ = (
+        "udid", "_default_name", "connected", "connection_type",
+        "_real_name", "_custom_name", "_name_cache",
+    )
+
+    def __init__(
+        self,
+        udid: str,
+        name: str = "Unknown",
+        persisted: Optional[Tuple[Optional[str], Optional[str]]] = None,
+    ) -> None:
+        """Initializes the BaseDevice and loads persisted names.
+
+        Args:
+            udid: The Unique Device Identifier.
+            name: Fallback display name.
+            persisted: Preloaded (real_name, custom_name). Queried from the
+                database when None.
+        """
         self.udid = udid
         self._default_name = name
         self.connected = False
         self.connection_type = "unknown"
-        
-        self.real_name: Optional[str] = None
-        self.custom_name: Optional[str] = None
 
         # Load persisted names
-        self.real_name, self.custom_name = get_device_info_from_db(udid)
+        if persisted is None:
+            persisted = get_device_info_from_db(udid)
+        self._real_name: Optional[str] = persisted[0]
+        self._custom_name: Optional[str] = persisted[1]
+        self._name_cache = ""
+        self._refresh_name()
+
+    @property
+    def real_name(self) -> Optional[str]:
+        """Name retrieved from the device hardware."""
+        return self._real_name
+
+    @real_name.setter
+    def real_name(self, value: Optional[str]) -> None:
+        self._real_name = value
+        self._refresh_name()
+
+    @property
+    def custom_name(self) -> Optional[str]:
+        """Name assigned by the user."""
+        return self._custom_name
+
+    @custom_name.setter
+    def custom_name(self, value: Optional[str]) -> None:
+        self._custom_name = value
+        self._refresh_name()
+
+    def _refresh_name(self) -> None:
+        """Recomputes the cached display name (Custom > Real > Default)."""
+        self._name_cache = self._custom_name or self._real_name or self._default_name
 
     @property
     def name(self) -> str:
-        """Returns the display name (Custom > Real > Default)."""
-        if self.custom_name:
-            return self.custom_name
-        if self.real_name:
-            return self.real_name
-        return self._default_name
+        """Returns the display name (Custom > Real > Default).
+
+        Cached on write of real_name/custom_name, since it is read on every
+        device list refresh.
+        """
+        return self._name_cache
 
     async def connect(self) -> None:
         """Establishes a connection to the device."""
@@ -169,6 +567,18 @@ class BaseDevice:
         """
         raise NotImplementedError
 
+    async def set_location_async(self, lat: float, lon: float) -> None:
+        """Updates the device's location without blocking the event loop.
+
+        set_location does blocking socket I/O, so it runs in a worker thread;
+        this lets the simulator update several devices concurrently.
+
+        Args:
+            lat: Latitude.
+            lon: Longitude.
+        """
+        await asyncio.to_thread(self.set_location, lat, lon)
+
     def disconnect(self) -> None:
         """Closes the connection to the device."""
         raise NotImplementedError
@@ -185,12 +595,20 @@ class IOSDevice(BaseDevice):
         rsd_info: Tuple of (host, port) for RSD connections, if available.
     """
 
+    device_type = "iOS"
+
+    __slots__ = (
+        "serial", "rsd_info", "_lockdown", "_service", "_dvt_context", "_name_task", "_rsd_address",
+        "_service_lock",
+    )
+
     def __init__(
         self,
         udid: str,
         serial: Optional[str] = None,
         connection_type: str = "usb",
         rsd_info: Optional[Tuple[str, int]] = None,
+        persisted: Optional[Tuple[Optional[str], Optional[str]]] = None,
     ) -> None:
         """Initializes the IOSDevice.
 
@@ -199,8 +617,9 @@ class IOSDevice(BaseDevice):
             serial: The device serial number. Defaults to udid if None.
             connection_type: 'usb' or 'wifi'.
             rsd_info: Optional tuple (host, port) for RSD connections.
+            persisted: Preloaded (real_name, custom_name), if available.
         """
-        super().__init__(udid, name=f"iPhone ({udid[:8]}...)")
+        super().__init__(udid, name=f"iPhone ({udid[:8]}...)", persisted=persisted)
         self.serial = serial or udid
         self.connection_type = connection_type
         self.rsd_info = rsd_info
@@ -208,6 +627,12 @@ class IOSDevice(BaseDevice):
         self._lockdown: Any = None
         self._service: Any = None
         self._dvt_context: Any = None
+        self._name_task: Optional[asyncio.Task] = None
+        # Tunnel address of self._lockdown when it is an RSD client
+        self._rsd_address: Optional[Tuple[str, int]] = None
+        # Serializes set/clear/close on the location service channel; an
+        # update cancelled by stop() keeps running in its worker thread
+        self._service_lock = threading.Lock()
 
     async def connect(self) -> None:
         """Connects to the iOS device and attempts to fetch its real name.
@@ -219,13 +644,18 @@ class IOSDevice(BaseDevice):
             if self.connection_type == "wifi" and self.rsd_info:
                 await self._connect_rsd()
             else:
-                self._connect_usb()
+                # Moved from the tunnel to USB; release the cached RSD client
+                await self._close_rsd()
+                # usbmux/lockdown calls block; keep them off the event loop so
+                # DevicePool.connect_all can overlap several devices
+                await asyncio.to_thread(self._connect_usb)
             
             self.connected = True
             logger.info("Device %s connected via %s", self.udid, self.connection_type)
             
-            # Fetch real name after successful connection
-            self._fetch_device_name()
+            # Fetch real name in the background; simulation does not need it.
+            # Keep a reference so the task is not garbage collected.
+            self._name_task = asyncio.create_task(asyncio.to_thread(self._fetch_device_name))
 
         except Exception as e:
             self.connected = False
@@ -246,34 +676,82 @@ class IOSDevice(BaseDevice):
             logger.warning("Could not fetch device name for %s: %s", self.udid, e)
 
     async def _connect_rsd(self) -> None:
-        """Internal method to connect via Remote Service Discovery (RSD)."""
+        """Internal method to connect via Remote Service Discovery (RSD).
+
+        The RSD client survives disconnect(), so reconnecting through the
+        same tunnel skips the RSD handshake and only restarts DVT. A stale
+        client is closed and replaced.
+        """
         if not self.rsd_info:
             raise ValueError("RSD info is missing.")
         
         host, port = self.rsd_info
+        address = (host, int(port))
+
+        if self._rsd_address == address:
+            try:
+                self._start_dvt_service()
+                return
+            except Exception as e:
+                logger.info("Cached RSD for %s is stale, reconnecting: %s", self.udid, e)
+                await self._close_rsd()
+        elif self._rsd_address is not None:
+            await self._close_rsd()  # Tunnel moved; drop the old client
+
         logger.info("Connecting via RSD: %s:%s", host, port)
         
-        rsd = RemoteServiceDiscoveryService((host, int(port)))
+        rsd = RemoteServiceDiscoveryService(address)
         await rsd.connect()
 
         self._lockdown = rsd
-        self._dvt_context = DvtSecureSocketProxyService(rsd)
+        self._rsd_address = address
+        self._start_dvt_service()
+
+    async def _close_rsd(self) -> None:
+        """Closes the cached RSD client, if any."""
+        if self._rsd_address is None:
+            return  # self._lockdown, if set, is a usbmux client
+        rsd, self._rsd_address = self._lockdown, None
+        self._lockdown = None
+        try:
+            await rsd.close()
+        except Exception as e:
+            logger.debug("Error closing RSD for %s: %s", self.udid, e)
+
+    def _start_dvt_service(self) -> None:
+        """Starts DVT LocationSimulation on the current lockdown/RSD client."""
+        self._dvt_context = DvtSecureSocketProxyService(self._lockdown)
         self._dvt_context.__enter__()
         self._service = LocationSimulation(self._dvt_context)
 
     def _connect_usb(self) -> None:
-        """Internal method to connect via standard USB mux."""
+        """Internal method to connect via standard USB mux.
+
+        The service kind that worked last time is remembered per device, so
+        iOS 17+ devices skip the DtSimulateLocation probe that always fails.
+        """
         logger.info("Connecting via USB: %s", self.serial)
         self._lockdown = create_using_usbmux(serial=self.serial)
 
+        known_kind = get_service_kind_from_db(self.udid)
+        if known_kind == SERVICE_KIND_DVT:
+            try:
+                self._start_dvt_service()
+                return
+            except Exception as e:
+                logger.info("Cached DVT service failed for %s, probing: %s", self.udid, e)
+
         # Try legacy service first, then DVT
         try:
             self._service = DtSimulateLocation(self._lockdown)
+            kind = SERVICE_KIND_LEGACY
         except InvalidServiceError:
             logger.info("DtSimulateLocation not available, trying DVT...")
-            self._dvt_context = DvtSecureSocketProxyService(self._lockdown)
-            self._dvt_context.__enter__()
-            self._service = LocationSimulation(self._dvt_context)
+            self._start_dvt_service()
+            kind = SERVICE_KIND_DVT
+
+        if kind != known_kind:
+            update_service_kind_in_db(self.udid, kind)
 
     def set_location(self, lat: float, lon: float) -> None:
         """Sets the simulated location on the device.
@@ -285,30 +763,36 @@ class IOSDevice(BaseDevice):
         Raises:
             DeviceControlError: If setting location fails.
         """
-        if not self._service:
-            raise DeviceControlError(self.udid, "set location", "Service not available")
-        
-        try:
-            self._service.set(lat, lon)
-        except Exception as e:
-            logger.error("Error setting location for %s: %s", self.udid, e)
-            self.connected = False
-            raise DeviceControlError(self.udid, "set location", str(e))
+        with self._service_lock:
+            if not self._service:
+                raise DeviceControlError(self.udid, "set location", "Service not available")
+            
+            try:
+                self._service.set(lat, lon)
+            except Exception as e:
+                logger.error("Error setting location for %s: %s", self.udid, e)
+                self.connected = False
+                raise DeviceControlError(self.udid, "set location", str(e))
 
     def disconnect(self) -> None:
-        """Stops simulation and closes connections."""
-        if self._service:
-            try:
-                self._service.clear()
-            except Exception:
-                pass
+        """Stops simulation and closes connections.
 
-        if self._dvt_context:
-            try:
-                self._dvt_context.__exit__(None, None, None)
-            except Exception:
-                pass
-        self.connected = False
+        Waits for an update still running on the service channel, so this
+        blocks and must be called off the event loop.
+        """
+        with self._service_lock:
+            if self._service:
+                try:
+                    self._service.clear()
+                except Exception:
+                    pass
+
+            if self._dvt_context:
+                try:
+                    self._dvt_context.__exit__(None, None, None)
+                except Exception:
+                    pass
+            self.connected = False
 
 
 class AndroidDevice(BaseDevice):
@@ -317,19 +801,36 @@ class AndroidDevice(BaseDevice):
     Attributes:
         serial: The ADB device serial number.
         adb_client: An active ppadb Client instance.
+        model: The ro.product.model property, if already known.
     """
 
-    def __init__(self, serial: str, adb_client: Any) -> None:
+    device_type = "Android"
+
+    __slots__ = ("serial", "adb_client", "model", "_device", "_shell_conn", "_shell_lock")
+
+    def __init__(
+        self,
+        serial: str,
+        adb_client: Any,
+        persisted: Optional[Tuple[Optional[str], Optional[str]]] = None,
+        model: Optional[str] = None,
+    ) -> None:
         """Initializes the AndroidDevice.
 
         Args:
             serial: The ADB device serial number.
             adb_client: An active ppadb Client instance.
+            persisted: Preloaded (real_name, custom_name), if available.
+            model: Preloaded ro.product.model, if available.
         """
-        super().__init__(udid=serial, name=f"Android ({serial[:8]}...)")
+        super().__init__(udid=serial, name=f"Android ({serial[:8]}...)", persisted=persisted)
         self.serial = serial
         self.adb_client = adb_client
+        self.model = model
         self._device: Any = None
+        self._shell_conn: Any = None
+        # Serializes commands on the persistent shell; at most one in flight
+        self._shell_lock = threading.Lock()
         self.connection_type = "adb"
 
     async def connect(self) -> None:
@@ -341,12 +842,14 @@ class AndroidDevice(BaseDevice):
             
             # Fetch real device model name
             try:
-                model = self._device.get_properties().get("ro.product.model", "Unknown")
-                self.real_name = f"{model} ({self.serial})"
+                if not self.model:
+                    self.model = fetch_android_model(self._device)
+                self.real_name = f"{self.model} ({self.serial})"
                 update_device_info_in_db(self.udid, real_name=self.real_name)
             except Exception as e:
                 logger.warning("Could not fetch Android properties: %s", e)
 
+            self._open_shell()
             self.connected = True
             logger.info("Android device %s connected", self.serial)
         except Exception as e:
@@ -354,6 +857,62 @@ class AndroidDevice(BaseDevice):
             logger.error("Failed to connect to Android %s: %s", self.serial, e)
             raise
 
+    def _open_shell(self) -> None:
+        """Opens a persistent interactive shell used for location updates.
+
+        Each one-shot shell() spawns a new adbd session on the device, so
+        high-frequency updates are written into a single long-lived shell
+        instead. Failure is non-fatal; set_location falls back to shell().
+        """
+        try:
+            conn = self._device.create_connection()
+            conn.send("shell:")
+            # Bounds the wait for a command's completion marker
+            conn.socket.settimeout(ANDROID_SHELL_TIMEOUT)
+            self._shell_conn = conn
+        except Exception as e:
+            logger.warning("Could not open persistent shell for %s: %s", self.serial, e)
+            self._shell_conn = None
+
+    def _close_shell(self) -> None:
+        """Closes the persistent shell, if open."""
+        if self._shell_conn:
+            try:
+                self._shell_conn.close()
+            except Exception:
+                pass
+            self._shell_conn = None
+
+    def _write_shell(self, cmd: str) -> None:
+        """Runs a command on the persistent shell and waits for it to finish.
+
+        The command is followed by an echo of ANDROID_SHELL_DONE, and output
+        is read and discarded until the marker arrives. Each update thus
+        returns only once the device has processed it, so commands never
+        queue up on the device behind the simulator.
+
+        Args:
+            cmd: The shell command line.
+
+        Raises:
+            ConnectionError: If the shell has been closed by the device.
+            TimeoutError: If the command does not complete within
+                ANDROID_SHELL_TIMEOUT seconds.
+        """
+        sock = self._shell_conn.socket
+        sock.sendall((cmd + ANDROID_SHELL_DONE_CMD).encode())
+        # Keep enough of the previous chunk to match a marker split across reads
+        keep = len(ANDROID_SHELL_DONE) - 1
+        tail = b""
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("ADB shell closed")
+            data = tail + chunk
+            if ANDROID_SHELL_DONE in data:
+                return
+            tail = data[-keep:]
+
     def set_location(self, lat: float, lon: float) -> None:
         """Sets the location by sending a startservice intent to Fake GPS.
         
@@ -364,21 +923,57 @@ class AndroidDevice(BaseDevice):
         if not self._device:
             return
 
+        # Construct the broadcast command for com.lexa.fakegps
+        cmd = f"{ANDROID_LOCATION_CMD_PREFIX}{lat} --ed long {lon}"
+        if self._try_write_shell(cmd):
+            return
+        if not self.connected:
+            return  # Disconnected while the command was in flight
+
         try:
-            # Construct the broadcast command for com.lexa.fakegps
-            # Using --ed (double) for precision
-            cmd = (
-                f"am startservice -a {ANDROID_INTENT_ACTION} "
-                f"--ed lat {lat} --ed long {lon}"
-            )
             self._device.shell(cmd)
         except Exception as e:
             logger.error("Error setting location for Android %s: %s", self.serial, e)
             self.connected = False
 
+    def _try_write_shell(self, cmd: str) -> bool:
+        """Writes cmd to the persistent shell, closing it on failure.
+
+        Returns:
+            True if the command was written.
+        """
+        with self._shell_lock:
+            if not self._shell_conn:
+                return False
+            try:
+                self._write_shell(cmd)
+                return True
+            except Exception as e:
+                logger.warning(
+                    "Persistent shell failed for %s, falling back: %s", self.serial, e
+                )
+                self._close_shell()
+                return False
+
     def disconnect(self) -> None:
-        """Disconnects the device (logical disconnect)."""
+        """Disconnects the device (logical disconnect).
+
+        Never waits for _shell_lock, so it is safe on the event loop. A
+        command still in flight is unblocked by shutting the socket down,
+        and the worker's failure path then closes the shell.
+        """
         self.connected = False
+        conn = self._shell_conn
+        if conn:
+            try:
+                conn.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._shell_lock.acquire(blocking=False):
+            try:
+                self._close_shell()
+            finally:
+                self._shell_lock.release()
 
 
 class DevicePool:
@@ -386,25 +981,84 @@ class DevicePool:
 
     def __init__(self) -> None:
         self.devices: Dict[str, BaseDevice] = {}
-        self.adb_client = None
+        # ADB client is created lazily on first use (see adb_client)
+        self._adb_client: Any = None
+        self._adb_probed_at: Optional[float] = None
+        # usbmuxd, tunneld and adb-server are probed in parallel on each scan
+        self._scan_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="device-scan")
+        # iOS device list from the last usbmuxd query, reused until it changes
+        self._ios_snapshot: List[Any] = []
+        self._usbmux_watcher = _UsbmuxWatcher()
         init_db()
-        
-        if ADB_AVAILABLE:
-            try:
-                self.adb_client = AdbClient(host="127.0.0.1", port=5037)
-            except Exception as e:
-                logger.warning("Failed to initialize ADB client: %s", e)
 
-    def scan_usb_devices(self) -> List[BaseDevice]:
-        """Scans for connected devices via USB, Tunneld, and ADB."""
-        found_devices: List[BaseDevice] = []
-        
-        # --- 1. iOS Scanning ---
-        ios_devices = list_ios_devices()
+    @property
+    def adb_client(self) -> Any:
+        """Returns a live ppadb Client, or None if adb-server is unavailable.
+
+        The client is created and pinged on first access and cached. An
+        offline result is cached too, so scans do not stall on a dead server;
+        it is re-probed after ADB_RETRY_INTERVAL seconds or on reset_adb().
+        """
+        if not ADB_AVAILABLE:
+            return None
+        if self._adb_client is None:
+            now = time.monotonic()
+            if self._adb_probed_at is None or now - self._adb_probed_at >= ADB_RETRY_INTERVAL:
+                self._adb_probed_at = now
+                self._adb_client = self._probe_adb()
+        return self._adb_client
+
+    @staticmethod
+    def _probe_adb() -> Any:
+        """Creates an ADB client and checks that the server answers.
+
+        Returns:
+            The ppadb Client, or None if the server did not respond.
+        """
+        try:
+            client = AdbClient(host="127.0.0.1", port=5037)
+            client.version()
+            return client
+        except Exception as e:
+            logger.warning("ADB server unavailable: %s", e)
+            return None
+
+    def reset_adb(self) -> None:
+        """Drops the cached ADB client so the next access re-probes the server."""
+        self._adb_client = None
+        self._adb_probed_at = None
+
+    async def close(self) -> None:
+        """Closes cached RSD tunnel clients; called on application shutdown."""
+        for dev in list(self.devices.values()):
+            if isinstance(dev, IOSDevice):
+                await dev._close_rsd()  # pylint: disable=protected-access
+
+    async def wal_maintenance_loop(self, interval: float = WAL_CHECKPOINT_INTERVAL) -> None:
+        """Background task that checkpoints the device database periodically.
+
+        Args:
+            interval: Seconds between checkpoints.
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.to_thread(checkpoint_wal)
+        except asyncio.CancelledError:
+            logger.debug("WAL maintenance loop cancelled.")
+
+    @staticmethod
+    def _list_tunnel_map() -> Dict[str, Tuple[str, int]]:
+        """Queries tunneld for active RSD tunnels.
+
+        Returns:
+            A dict mapping udid to the (host, port) of its first tunnel.
+            Empty if tunneld is unreachable.
+        """
         tunnel_map: Dict[str, Tuple[str, int]] = {}
+        if not TUNNELD_AVAILABLE:
+            return tunnel_map
         try:
-            # pylint: disable=import-outside-toplevel, protected-access
-            from pymobiledevice3.tunneld.api import _list_tunnels
             tunnels_dict = _list_tunnels()
             for t_udid, t_list in tunnels_dict.items():
                 if t_list:
@@ -416,6 +1070,58 @@ class DevicePool:
                         )
         except Exception:
             pass
+        return tunnel_map
+
+    def scan_usb_devices(self) -> List[BaseDevice]:
+        """Scans for connected devices via USB, Tunneld, and ADB."""
+        found_devices: List[BaseDevice] = []
+        db_batch = _DBBatch()
+        
+        self._usbmux_watcher.start()
+        ios_future = (
+            self._scan_executor.submit(list_ios_devices)
+            if self._usbmux_watcher.consume_change()
+            else None
+        )
+        tunnel_future = self._scan_executor.submit(self._list_tunnel_map)
+        adb_client = self.adb_client
+        adb_future = self._scan_executor.submit(adb_client.devices) if adb_client else None
+
+        # --- 1. iOS Scanning ---
+        if ios_future:
+            try:
+                self._ios_snapshot = ios_future.result()
+            except Exception:
+                # The change was consumed but not applied; retry next scan
+                self._usbmux_watcher.mark_changed()
+                raise
+        ios_devices = self._ios_snapshot
+        tunnel_map = tunnel_future.result()
+
+        # --- 2. Android Scanning ---
+        android_devs: List[Any] = []
+        if adb_future:
+            try:
+                android_devs = adb_future.result()
+            except Exception as e:
+                logger.debug("ADB scan failed: %s", e)
+                self.reset_adb()
+
+        # --- 3. Merge ---
+        # Load persisted names for newly discovered devices in one query.
+        # Known devices keep their in-memory names, which rename_device and
+        # name fetching update directly.
+        db_info = get_devices_info_from_db([
+            serial
+            for serial in [dev.serial for dev in ios_devices] + [adev.serial for adev in android_devs]
+            if serial not in self.devices
+        ])
+        # Read models of newly attached Android devices concurrently
+        model_futures = {
+            adev.serial: self._scan_executor.submit(fetch_android_model, adev)
+            for adev in android_devs
+            if adev.serial not in self.devices
+        }
 
         for dev in ios_devices:
             udid = dev.serial
@@ -428,6 +1134,7 @@ class DevicePool:
                     serial=dev.serial,
                     connection_type=conn_type,
                     rsd_info=rsd_info,
+                    persisted=db_info.get(udid, (None, None)),
                 )
                 self.devices[udid] = new_dev
                 found_devices.append(new_dev)
@@ -437,29 +1144,67 @@ class DevicePool:
                 if isinstance(existing, IOSDevice):
                     existing.rsd_info = rsd_info
                     existing.connection_type = conn_type
-                    existing.real_name, existing.custom_name = get_device_info_from_db(udid)
                     found_devices.append(existing)
 
-        # --- 2. Android Scanning ---
-        if self.adb_client:
-            try:
-                android_devs = self.adb_client.devices()
-                for adev in android_devs:
-                    serial = adev.serial
-                    if serial not in self.devices:
-                        new_android = AndroidDevice(serial, self.adb_client)
-                        self.devices[serial] = new_android
-                        found_devices.append(new_android)
-                    else:
-                        existing_android = self.devices[serial]
-                        if isinstance(existing_android, AndroidDevice):
-                            existing_android.real_name, existing_android.custom_name = get_device_info_from_db(serial)
-                            found_devices.append(existing_android)
-            except Exception as e:
-                logger.debug("ADB scan failed: %s", e)
+        for adev in android_devs:
+            serial = adev.serial
+            if serial not in self.devices:
+                try:
+                    model = model_futures[serial].result()
+                except Exception as e:
+                    logger.debug("Could not read model of %s: %s", serial, e)
+                    model = None
+                new_android = AndroidDevice(
+                    serial,
+                    adb_client,
+                    persisted=db_info.get(serial, (None, None)),
+                    model=model,
+                )
+                if model:
+                    new_android.real_name = f"{model} ({serial})"
+                    db_batch.append(serial, real_name=new_android.real_name)
+                self.devices[serial] = new_android
+                found_devices.append(new_android)
+            else:
+                existing_android = self.devices[serial]
+                if isinstance(existing_android, AndroidDevice):
+                    found_devices.append(existing_android)
+
+        try:
+            db_batch.flush()
+        except DatabaseError:
+            pass  # Names stay in memory; they are persisted again on connect
 
         return found_devices
 
+    async def connect_all(self, udids: Optional[List[str]] = None) -> Dict[str, Exception]:
+        """Connects disconnected devices concurrently.
+
+        Args:
+            udids: Devices to connect. Defaults to every managed device.
+                Unknown UDIDs are ignored, and duplicates connect once.
+
+        Returns:
+            A dict mapping udid to the exception raised for each device that
+            failed to connect. Empty if all succeeded.
+        """
+        if udids is None:
+            targets = list(self.devices.values())
+        else:
+            # Order-preserving dedup; two concurrent connect() calls on one
+            # device would leak a lockdown/DVT context
+            targets = [self.devices[u] for u in dict.fromkeys(udids) if u in self.devices]
+        targets = [d for d in targets if not d.connected]
+
+        results = await asyncio.gather(*(d.connect() for d in targets), return_exceptions=True)
+
+        failures: Dict[str, Exception] = {}
+        for dev, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error("Could not connect to %s: %s", dev.udid, result)
+                failures[dev.udid] = result
+        return failures
+
     def get_device(self, udid: str) -> Optional[BaseDevice]:
         """Retrieves a device by its UDID."""
         return self.devices.get(udid)
@@ -476,6 +1221,11 @@ class DevicePool:
         """
         if not new_name.strip():
             return False
+
+        # Skip the write for no-op renames (e.g. UI re-submitting on blur)
+        device = self.devices.get(udid)
+        if device is not None and device.custom_name == new_name:
+            return True
             
         update_device_info_in_db(udid, custom_name=new_name)
         
@@ -1,31 +1,179 @@
 """Handles parsing of GPX files for location simulation."""
 
+import functools
 import logging
+import math
+import xml.etree.ElementTree as ET
+from array import array
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, TypedDict
-
-import gpxpy
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, TypedDict
 
 from core.exceptions import GPXParseError, GPXEmptyError
 
 logger = logging.getLogger(__name__)
 
+# Same constants as gpxpy.geo, so track lengths match gpx.length_2d()
+EARTH_RADIUS_M = 6378137.0  # equatorial Earth radius in meters
+ONE_DEGREE_M = (2 * math.pi * EARTH_RADIUS_M) / 360  # meters per degree
+# Point pairs further apart than this (degrees) use haversine, as in gpxpy
+FLAT_DISTANCE_MAX_DEGREES = 0.2
+
 
 class TrackPoint(TypedDict):
     """Represents a single GPS track point."""
     lat: float
     lon: float
-    ele: float
+    ele: Optional[float]
     time: Any  # datetime object
 
 
 class GPXData(TypedDict):
-    """Represents parsed GPX data with metadata."""
-    points: List[TrackPoint]
+    """Represents parsed GPX data with metadata.
+
+    Points are stored column-wise (structure of arrays): index i of every
+    column describes track point i. The float columns are contiguous
+    array('d') buffers rather than one dict per point.
+    """
+    lats: array  # degrees
+    lons: array  # degrees
+    eles: array  # meters, NaN where the GPX has no elevation
+    times: List[Any]  # datetime objects or None
+    timestamps: array  # POSIX seconds, NaN where times is None
+    has_timestamps: bool  # True if every point has a time
+    distances: array  # cumulative meters from the first point
     total_distance: float  # in meters
     total_duration: float  # in seconds
 
 
+def _local_name(tag: str) -> str:
+    """Strips the XML namespace from an element tag."""
+    return tag.rpartition("}")[2]
+
+
+def _cumulative_distances(lats: array, lons: array, segment_starts: Iterable[int]) -> array:
+    """Computes the distance travelled up to every point.
+
+    Follows gpxpy's length_2d: nearby points use its flat-earth
+    approximation, and pairs more than FLAT_DISTANCE_MAX_DEGREES apart use
+    haversine. Gaps between track segments are not counted, matching gpxpy.
+
+    Args:
+        lats: Latitudes in degrees.
+        lons: Longitudes in degrees.
+        segment_starts: Indices of the first point of each segment.
+
+    Returns:
+        Cumulative distance in meters; the last entry is the track length.
+    """
+    radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+    starts = set(segment_starts)
+    starts.add(0)
+
+    cumulative = array("d")
+    total = 0.0
+    prev_lat = prev_lon = 0.0
+    for i, (lat, lon) in enumerate(zip(lats, lons)):
+        if i not in starts:
+            dlat = lat - prev_lat
+            dlon = lon - prev_lon
+            if abs(dlat) > FLAT_DISTANCE_MAX_DEGREES or abs(dlon) > FLAT_DISTANCE_MAX_DEGREES:
+                phi = radians(lat)
+                prev_phi = radians(prev_lat)
+                sin_dphi = sin((phi - prev_phi) / 2)
+                sin_dlambda = sin(radians(dlon) / 2)
+                a = sin_dphi * sin_dphi + sin_dlambda * sin_dlambda * cos(phi) * cos(prev_phi)
+                total += EARTH_RADIUS_M * 2 * asin(sqrt(a))
+            else:
+                y = dlon * cos(radians(lat))
+                total += sqrt(dlat * dlat + y * y) * ONE_DEGREE_M
+        prev_lat, prev_lon = lat, lon
+        cumulative.append(total)
+    return cumulative
+
+
+def _posix_seconds(time: Optional[datetime]) -> float:
+    """Converts a point time to POSIX seconds.
+
+    Naive times are read as UTC so that deltas between them do not shift
+    across local DST changes.
+
+    Returns:
+        Seconds since the epoch, or NaN if time is None.
+    """
+    if time is None:
+        return math.nan
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return time.timestamp()
+
+
+def _parse_time(text: str) -> datetime:
+    """Parses a GPX <time> value.
+
+    datetime.fromisoformat accepts a trailing 'Z' only from Python 3.11,
+    so it is rewritten as '+00:00' first.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 timestamp.
+    """
+    text = text.strip()
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    return datetime.fromisoformat(text)
+
+
+def _segment_duration(times: List[Any], start: int, end: int) -> Optional[float]:
+    """Duration of times[start:end] in seconds, following gpxpy's rules.
+
+    Returns:
+        0.0 for segments shorter than two points, None if the segment has
+        no usable start/end time.
+    """
+    if end - start < 2:
+        return 0.0
+    first = times[start] or times[start + 1]
+    last = times[end - 1] or times[end - 2]
+    if not first or not last or last < first:
+        return None
+    return (last - first).total_seconds()
+
+
+def iter_track_points(data: GPXData) -> Iterator[TrackPoint]:
+    """Yields per-point dicts from columnar GPX data.
+
+    Args:
+        data: Parsed GPX data.
+
+    Yields:
+        One TrackPoint per track point. Missing elevations are None.
+    """
+    for lat, lon, ele, time in zip(data["lats"], data["lons"], data["eles"], data["times"]):
+        yield {
+            "lat": lat,
+            "lon": lon,
+            "ele": None if math.isnan(ele) else ele,
+            "time": time,
+        }
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_cached(path: str, mtime_ns: int, size: int) -> GPXData:
+    """Parses a GPX file, memoized on its path, mtime and size.
+
+    The stat fields are part of the key so a modified file is re-parsed.
+
+    Args:
+        path: The string path to the .gpx file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The parsed GPX data. Shared between callers; must not be mutated.
+    """
+    return GPXHandler(path)._parse_file()
+
+
 class GPXHandler:
     """Parses GPX files to extract track points and metadata.
 
@@ -44,9 +192,16 @@ class GPXHandler:
     def parse(self) -> GPXData:
         """Parses the GPX file and extracts track points and metadata.
 
+        Results are cached per file version, so repeated calls for an
+        unchanged file skip the XML parse. The returned dict is fresh, but
+        its columns are shared between callers and must not be mutated.
+
         Returns:
             A dictionary containing:
-            - points: List of track points.
+            - lats, lons, eles, times: Per-point columns.
+            - timestamps: Point times as POSIX seconds.
+            - has_timestamps: Whether every point has a time.
+            - distances: Cumulative distance in meters at each point.
             - total_distance: Total track length in meters.
             - total_duration: Total duration in seconds.
 
@@ -54,52 +209,179 @@ class GPXHandler:
             GPXParseError: If the GPX file cannot be parsed.
             GPXEmptyError: If the GPX file contains no track points.
         """
-        logger.info("Parsing GPX file: %s", self.file_path)
-        
-        if not self.file_path.exists():
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
             raise GPXParseError(str(self.file_path), "File not found")
+
+        data = _parse_cached(str(self.file_path), stat.st_mtime_ns, stat.st_size)
+        return GPXData(**data)
+
+    def _parse_file(self) -> GPXData:
+        """Reads and parses the GPX file without caching.
+
+        Raises:
+            GPXParseError: If the GPX file cannot be parsed.
+            GPXEmptyError: If the GPX file contains no track points.
+        """
+        logger.info("Parsing GPX file: %s", self.file_path)
         
-        points: List[TrackPoint] = []
         try:
-            with self.file_path.open('r', encoding='utf-8') as gpx_file:
-                gpx = gpxpy.parse(gpx_file)
+            try:
+                data = self._stream_parse()
+            except (ET.ParseError, ValueError, TypeError) as e:
+                logger.debug("Streaming parse failed (%s), retrying with gpxpy", e)
+                data = self._gpxpy_parse()
 
-                # 1. Extract Metadata using gpxpy's built-in methods
-                total_distance = gpx.length_2d()  # Meters
-                total_duration = gpx.get_duration() or 0.0  # Seconds
-
-                # 2. Extract Points
-                for track in gpx.tracks:
-                    for segment in track.segments:
-                        for point in segment.points:
-                            points.append({
-                                'lat': point.latitude,
-                                'lon': point.longitude,
-                                'ele': point.elevation,
-                                'time': point.time
-                            })
-
-            if not points:
+            lats = data["lats"]
+            total_distance = data["total_distance"]
+            total_duration = data["total_duration"]
+            if not lats:
                 logger.warning("No track points found in %s", self.file_path)
                 raise GPXEmptyError(str(self.file_path))
             
             logger.info(
                 "Loaded %d points. Dist: %.2fm, Dur: %.2fs",
-                len(points), total_distance, total_duration
+                len(lats), total_distance, total_duration
             )
 
-            return {
-                "points": points,
-                "total_distance": total_distance,
-                "total_duration": total_duration
-            }
+            return data
 
         except (GPXParseError, GPXEmptyError):
             raise
-        except gpxpy.gpx.GPXException as e:
-            logger.error("Invalid GPX format: %s", e)
-            raise GPXParseError(str(self.file_path), f"Invalid GPX format: {str(e)}")
         except Exception as e:
             logger.error("Error parsing GPX file: %s", e)
             raise GPXParseError(str(self.file_path), str(e))
-            raise
+
+    def _stream_parse(self) -> GPXData:
+        """Extracts track points with a streaming ElementTree parse.
+
+        Every element is detached from its parent as soon as it has been
+        processed (children of <trkpt> once the point is read), so the tree
+        never grows beyond the current point and memory stays flat for
+        large tracks.
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML.
+            ValueError: If a coordinate, elevation or timestamp is malformed.
+        """
+        lats = array("d")
+        lons = array("d")
+        eles = array("d")
+        times: List[Any] = []
+        segments: List[Tuple[int, int]] = []
+        seg_start = 0
+        in_track = False
+        has_timestamps = True
+
+        # (element, local name) of every element that is open
+        open_elems: List[Tuple[ET.Element, str]] = []
+
+        for event, elem in ET.iterparse(self.file_path, events=("start", "end")):
+            if event == "start":
+                name = _local_name(elem.tag)
+                open_elems.append((elem, name))
+                if name == "trk":
+                    in_track = True
+                elif name == "trkseg":
+                    seg_start = len(lats)
+                continue
+
+            name = open_elems.pop()[1]
+            if name == "trkpt" and in_track:
+                lats.append(float(elem.get("lat")))
+                lons.append(float(elem.get("lon")))
+                ele = None
+                time = None
+                for child in elem:
+                    child_name = _local_name(child.tag)
+                    if child_name == "ele" and child.text and child.text.strip():
+                        ele = float(child.text)
+                    elif child_name == "time" and child.text:
+                        time = _parse_time(child.text)
+                eles.append(math.nan if ele is None else ele)
+                times.append(time)
+                if time is None:
+                    has_timestamps = False
+            elif name == "trkseg" and in_track:
+                segments.append((seg_start, len(lats)))
+            elif name == "trk":
+                in_track = False
+
+            # A point's <ele>/<time> stay attached until the point is read
+            if open_elems and open_elems[-1][1] != "trkpt":
+                open_elems[-1][0].remove(elem)
+
+        total_duration: Optional[float] = 0.0
+        for start, end in segments:
+            if total_duration is not None:
+                seg_duration = _segment_duration(times, start, end)
+                total_duration = None if seg_duration is None else total_duration + seg_duration
+
+        distances = _cumulative_distances(lats, lons, (start for start, _ in segments))
+        return {
+            "lats": lats,
+            "lons": lons,
+            "eles": eles,
+            "times": times,
+            "timestamps": array("d", map(_posix_seconds, times)),
+            "has_timestamps": has_timestamps,
+            "distances": distances,
+            "total_distance": distances[-1] if distances else 0.0,  # Meters
+            "total_duration": total_duration or 0.0,  # Seconds
+        }
+
+    def _gpxpy_parse(self) -> GPXData:
+        """Extracts track points by building a full gpxpy object tree.
+
+        Slower than the streaming parse, but tolerant of input that
+        ElementTree rejects. gpxpy is imported here so that sessions which
+        never hit the fallback do not load it.
+
+        Raises:
+            GPXParseError: If gpxpy cannot parse the file.
+        """
+        import gpxpy
+
+        lats = array("d")
+        lons = array("d")
+        eles = array("d")
+        times: List[Any] = []
+        has_timestamps = True
+        segment_starts: List[int] = []
+        with self.file_path.open('r', encoding='utf-8') as gpx_file:
+            try:
+                gpx = gpxpy.parse(gpx_file)
+            except gpxpy.gpx.GPXException as e:
+                logger.error("Invalid GPX format: %s", e)
+                raise GPXParseError(str(self.file_path), f"Invalid GPX format: {str(e)}")
+
+            # 1. Extract Metadata using gpxpy's built-in methods
+            total_duration = gpx.get_duration() or 0.0  # Seconds
+
+            # 2. Extract Points
+            for track in gpx.tracks:
+                for segment in track.segments:
+                    segment_starts.append(len(lats))
+                    for point in segment.points:
+                        lats.append(point.latitude)
+                        lons.append(point.longitude)
+                        eles.append(
+                            math.nan if point.elevation is None else point.elevation
+                        )
+                        times.append(point.time)
+                        if point.time is None:
+                            has_timestamps = False
+
+        distances = _cumulative_distances(lats, lons, segment_starts)
+        return {
+            "lats": lats,
+            "lons": lons,
+            "eles": eles,
+            "times": times,
+            "timestamps": array("d", map(_posix_seconds, times)),
+            "has_timestamps": has_timestamps,
+            "distances": distances,
+            "total_distance": distances[-1] if distances else 0.0,
+            "total_duration": total_duration,
+        }
@@ -1,9 +1,26 @@
+import atexit
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
+# Background thread that drains the log queue into the real handlers.
+_listener: Optional[QueueListener] = None
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def setup_logging(
     log_dir: str = "logs",
     log_filename: str = "omni_app.log",
@@ -13,6 +30,13 @@ def setup_logging(
 ) -> None:
     """Configures the root logger with rotating file and stream handlers.
 
+    The root logger only gets a QueueHandler; a QueueListener thread does
+    the formatting and disk/console writes, so logging calls never block
+    the event loop on I/O. Thread/process record fields are not collected
+    since no format uses them. Logs on per-point hot paths should still be
+    guarded with ``logger.isEnabledFor(logging.DEBUG)`` so their arguments
+    are only built when the level is enabled.
+
     Args:
         log_dir: Directory to store log files.
         log_filename: Name of the log file.
@@ -20,6 +44,11 @@ def setup_logging(
         backup_count: Number of backup files to keep.
         log_level: Logging level (default: logging.INFO).
     """
+    # Skip record fields that no formatter below uses
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Ensure log directory exists
     os.makedirs(log_dir, exist_ok=True)
     log_path = os.path.join(log_dir, log_filename)
@@ -28,6 +57,7 @@ def setup_logging(
     root_logger.setLevel(log_level)
 
     # Remove existing handlers to avoid duplicates if called multiple times
+    _stop_listener()
     if root_logger.handlers:
         root_logger.handlers.clear()
 
@@ -40,18 +70,28 @@ def setup_logging(
         encoding='utf-8'
     )
     file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
 
     # 2. Stream Handler (Console)
     # Writes to stderr so it can still be captured by systemd/launchd if needed
     stream_handler = logging.StreamHandler(sys.stderr)
     stream_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
     )
     stream_handler.setFormatter(stream_formatter)
-    root_logger.addHandler(stream_handler)
 
-    logging.info(f"Logging configured. Log file: {log_path}")
+    # 3. Queue Handler
+    # Callers only enqueue the record; the listener thread writes it out.
+    global _listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    logging.info("Logging configured. Log file: %s", log_path)
@@ -3,10 +3,11 @@
 import asyncio
 import logging
 import random
-import time
-from typing import Any, Dict, List, Optional
+from array import array
+from typing import Any, Coroutine, Dict, List, Optional
 
 from core.device_manager import DevicePool, IOSDevice
+from core.gpx_handler import GPXData
 from core.exceptions import (
     SimulationAlreadyRunningError,
     SimulationNotRunningError,
@@ -16,6 +17,26 @@ from core.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# When behind schedule, yield with sleep(0) only every this many points;
+# the per-point device gather already suspends the task.
+ZERO_DELAY_YIELD_EVERY = 16
+# Maximum random offset (degrees, ~2 m) added per device to each point
+JITTER_DEGREES = 0.00002
+
+# Python 3.12+: run a task's coroutine inline up to its first real await
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+
+def _create_eager_task(coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+    """Creates a task that starts running immediately when supported.
+
+    Falls back to a regular asyncio.create_task on older Pythons. The task
+    still suspends at its first await, so cancellation works the same.
+    """
+    if _eager_task_factory is None:
+        return asyncio.create_task(coro)
+    return _eager_task_factory(asyncio.get_running_loop(), coro)
+
 
 class Simulator:
     """Controls the simulation lifecycle and broadcasts coordinates to devices.
@@ -52,7 +73,7 @@ class Simulator:
 
     async def start(
         self,
-        points: List[Dict[str, Any]],
+        track: GPXData,
         udids: List[str],
         loop_track: bool = False,
         speed_multiplier: float = 1.0,
@@ -61,7 +82,7 @@ class Simulator:
         """Starts the simulation loop for selected devices.
 
         Args:
-            points: A list of dicts representing track points (lat, lon, time).
+            track: Parsed GPX data (lat/lon/time columns).
             udids: A list of unique device identifiers to include in the simulation.
             loop_track: If True, restarts the track from the beginning upon completion.
             speed_multiplier: Factor to adjust playback speed (e.g., 2.0 is 2x speed).
@@ -76,16 +97,21 @@ class Simulator:
             logger.warning("Simulation is already running.")
             raise SimulationAlreadyRunningError()
 
+        # A repeated UDID would drive one device twice per point
+        udids = list(dict.fromkeys(udids))
+
+        # Connect all selected devices concurrently
+        failures = await self.device_pool.connect_all(udids)
+        if failures:
+            udid, error = next(iter(failures.items()))
+            if isinstance(error, DeviceConnectionError):
+                raise error
+            raise DeviceConnectionError(udid, str(error))
+
         self._active_devices = []  # Reset active devices list
         for udid in udids:
             dev = self.device_pool.get_device(udid)
             if dev:
-                if not dev.connected:
-                    try:
-                        await dev.connect()
-                    except Exception as e:
-                        logger.error("Could not connect to %s, skipping. Error: %s", udid, e)
-                        raise DeviceConnectionError(udid, str(e))
                 self._active_devices.append(dev)
             else:
                 logger.warning("Device %s not found in pool.", udid)
@@ -94,18 +120,21 @@ class Simulator:
             logger.error("No valid devices available for simulation.")
             raise NoDevicesAvailableError()
 
+        lats, lons = track["lats"], track["lons"]
         self.active = True
         self._update_status(
             running=True,
-            total_points=len(points),
+            total_points=len(lats),
             loop=loop_track,
             speed_multiplier=speed_multiplier,
-            current_lat=points[0]['lat'] if points else None,
-            current_lon=points[0]['lon'] if points else None,
+            current_lat=lats[0] if lats else None,
+            current_lon=lons[0] if lons else None,
         )
 
-        self.current_task = asyncio.create_task(
-            self._run_loop(points, self._active_devices, loop_track, speed_multiplier, target_duration)
+        # The first point is sent before start() returns instead of waiting
+        # one loop iteration for the task to be scheduled.
+        self.current_task = _create_eager_task(
+            self._run_loop(track, self._active_devices, loop_track, speed_multiplier, target_duration)
         )
         logger.info("Simulation started for %d devices.", len(self._active_devices))
 
@@ -128,11 +157,16 @@ class Simulator:
         await self.stop()
         
         logger.info("Resetting locations for %d devices...", len(self._active_devices))
-        for dev in self._active_devices:
-            try:
-                dev.disconnect() # This clears the location override
-            except Exception as e:
-                logger.error("Error resetting device %s: %s", dev.udid, e)
+        # disconnect() clears the location override. It waits for any update
+        # that stop() cancelled but whose worker thread is still running, so
+        # it runs off the loop as well.
+        results = await asyncio.gather(
+            *(asyncio.to_thread(dev.disconnect) for dev in self._active_devices),
+            return_exceptions=True,
+        )
+        for dev, result in zip(self._active_devices, results):
+            if isinstance(result, Exception):
+                logger.error("Error resetting device %s: %s", dev.udid, result)
         
         self._active_devices = []
         self._update_status(
@@ -146,9 +180,41 @@ class Simulator:
         """Helper to update the status dictionary."""
         self.status.update(kwargs)
 
+    @staticmethod
+    def _build_delays(
+        timestamps: array,
+        has_timestamps: bool,
+        constant_delay: float,
+        speed_multiplier: float,
+    ) -> array:
+        """Precomputes the pause after each point, once per playback.
+
+        Args:
+            timestamps: Per-point times in POSIX seconds.
+            has_timestamps: Whether every point has a timestamp.
+            constant_delay: Pause used when timestamps are unavailable, and
+                after the last point.
+            speed_multiplier: Speed adjustment factor.
+
+        Returns:
+            Seconds to wait after point i, clamped to reasonable bounds.
+        """
+        delays = array("d", [constant_delay]) * len(timestamps)
+        if has_timestamps:
+            for i in range(len(timestamps) - 1):
+                delays[i] = (timestamps[i + 1] - timestamps[i]) / speed_multiplier
+
+        for i, delay in enumerate(delays):
+            # Clamp sleep time to reasonable bounds
+            if delay > 300:
+                delays[i] = 5.0
+            elif delay < 0:
+                delays[i] = 0.0
+        return delays
+
     async def _run_loop(
         self,
-        points: List[Dict[str, Any]],
+        track: GPXData,
         devices: List[IOSDevice],
         loop_track: bool,
         speed_multiplier: float,
@@ -157,67 +223,84 @@ class Simulator:
         """Internal main loop for the simulation.
 
         Args:
-            points: List of GPX points.
+            track: Parsed GPX data.
             devices: List of target IOSDevice objects.
             loop_track: Whether to loop.
             speed_multiplier: Speed adjustment factor.
             target_duration: Fallback duration if timestamps are missing.
         """
         try:
-            # Check if we have valid timestamps
-            has_timestamps = all(p.get("time") for p in points)
+            lats, lons, timestamps = track["lats"], track["lons"], track["timestamps"]
+            num_points = len(lats)
+
+            # Determined once at parse time
+            has_timestamps = track["has_timestamps"]
             
             # Calculate constant delay for no-timestamp case
             constant_delay = 1.0
-            if not has_timestamps and target_duration and len(points) > 1:
-                 constant_delay = target_duration / len(points)
+            if not has_timestamps and target_duration and num_points > 1:
+                 constant_delay = target_duration / num_points
             elif not has_timestamps:
                  logger.warning("No timestamps and no target_duration. Defaulting to 1.0s delay.")
 
-            while self.active:
-                for i, point in enumerate(points):
-                    if not self.active:
-                        break
-
-                    # Record start time to account for execution overhead
-                    iteration_start = time.time()
-
-                    lat, lon = point["lat"], point["lon"]
-                    self.status["current_index"] = i
-                    self.status["current_lat"] = lat
-                    self.status["current_lon"] = lon
-
-                    # Broadcast location with simple jitter
-                    # TODO(Future): Move jitter logic to a separate helper or config.
-                    for dev in devices:
-                        jitter_lat = lat + random.uniform(-0.00002, 0.00002)
-                        jitter_lon = lon + random.uniform(-0.00002, 0.00002)
-                        dev.set_location(jitter_lat, jitter_lon)
-
-                    # Calculate sleep time
-                    sleep_time = constant_delay
-
-                    if has_timestamps and i < len(points) - 1:
-                        curr_time = points[i]["time"]
-                        next_time = points[i + 1]["time"]
-                        if curr_time and next_time:
-                            delta = (next_time - curr_time).total_seconds()
-                            sleep_time = delta / speed_multiplier
-                    
-                    # Clamp sleep time to reasonable bounds
-                    if sleep_time > 300:
-                        sleep_time = 5.0
-                    elif sleep_time < 0:
-                        sleep_time = 0.0
-
-                    # Subtract execution time to maintain accurate timing
-                    execution_time = time.time() - iteration_start
-                    adjusted_sleep = max(0, sleep_time - execution_time)
-                    
-                    if adjusted_sleep > 0:
-                        await asyncio.sleep(adjusted_sleep)
-
-                if not loop_track:
+            delays = self._build_delays(timestamps, has_timestamps, constant_delay, speed_multiplier)
+
+            # random.random is a C builtin; uniform() adds a Python frame per draw
+            rand = random.random
+            jitter_base = -JITTER_DEGREES
+            jitter_span = 2 * JITTER_DEGREES
+
+            loop = asyncio.get_running_loop()
+            # Bound once; the status dict object is never replaced
+            status = self.status
+            # stop() cancels this task; every point awaits at least once, so
+            # the CancelledError ends playback without polling self.active.
+            while True:
+                # Each point is due at the previous deadline plus its delay, so
+                # wakeup latency and send time do not accumulate into drift.
+                deadline = loop.time()
+                i = 0
+                while i < num_points:
+                    lat, lon = lats[i], lons[i]
+                    status["current_index"] = i
+                    status["current_lat"] = lat
+                    status["current_lon"] = lon
+
+                    # Broadcast location with simple jitter, to all devices at once.
+                    # Each update returns once the device has applied it, so the
+                    # time read below includes device-side lag.
+                    await asyncio.gather(*(
+                        dev.set_location_async(
+                            lat + jitter_base + jitter_span * rand(),
+                            lon + jitter_base + jitter_span * rand(),
+                        )
+                        for dev in devices
+                    ))
+
+                    deadline += delays[i]
+                    i += 1
+
+                    # If the following point is already overdue too, the next
+                    # one is stale: skip ahead to the latest due point instead
+                    # of replaying the backlog in a burst.
+                    now = loop.time()
+                    skipped = 0
+                    while i < num_points - 1 and deadline + delays[i] <= now:
+                        deadline += delays[i]
+                        i += 1
+                        skipped += 1
+                    if skipped and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Behind schedule; skipped %d stale points", skipped)
+
+                    sleep_for = deadline - now
+                    if sleep_for > 0:
+                        await asyncio.sleep(sleep_for)
+                    elif i % ZERO_DELAY_YIELD_EVERY == 0:
+                        # Densely timestamped tracks can have runs of
+                        # zero-delay points; yield to the loop now and then.
+                        await asyncio.sleep(0)
+
+                if not loop_track or not num_points:
                     break
 
         except Exception as e:
@@ -3,25 +3,46 @@ import logging
 import random
 import sys
 import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-try:
-    import gpxpy
-    from pymobiledevice3.exceptions import InvalidServiceError
-    from pymobiledevice3.lockdown import create_using_usbmux
-    from pymobiledevice3.remote.remote_service_discovery import RemoteServiceDiscoveryService
-    from pymobiledevice3.services.dvt.dvt_secure_socket_proxy import DvtSecureSocketProxyService
-    from pymobiledevice3.services.dvt.instruments.location_simulation import LocationSimulation
-    from pymobiledevice3.services.simulate_location import DtSimulateLocation
-    from pymobiledevice3.tunneld.api import get_tunneld_devices
-    from pymobiledevice3.usbmux import list_devices
-except ImportError as e:
-    print(f"Error: Missing dependency {e}")
-    print("Please run: pip install -r requirements.txt")
+logger = logging.getLogger(__name__)
+
+# gpxpy and pymobiledevice3 are imported where they are used, so that
+# --help and argument errors do not pay for loading them.
+
+
+def exit_missing_dependency(error: ImportError) -> None:
+    """
+    Report a missing dependency and exit
+    
+    Args:
+        error: The ImportError raised by the failed import
+    """
+    logger.error(f"Missing dependency {error}")
+    logger.error("Please run: pip install -r requirements.txt")
     sys.exit(1)
 
-logger = logging.getLogger(__name__)
+
+def parse_time(text: str) -> datetime:
+    """
+    Parse a GPX <time> value
+    
+    datetime.fromisoformat accepts a trailing 'Z' only from Python 3.11,
+    so it is rewritten as '+00:00' first.
+    
+    Args:
+        text: The element text
+    
+    Returns:
+        A timezone-aware datetime for UTC times
+    """
+    text = text.strip()
+    if text[-1:] in ('Z', 'z'):
+        text = text[:-1] + '+00:00'
+    return datetime.fromisoformat(text)
 
 
 def setup_logging():
@@ -68,18 +89,11 @@ class GPXHandler:
         """
         logger.info(f"Parsing GPX file: {self.file_path}")
         try:
-            with self.file_path.open('r') as gpx_file:
-                gpx = gpxpy.parse(gpx_file)
-
-                for track in gpx.tracks:
-                    for segment in track.segments:
-                        for point in segment.points:
-                            self.points.append({
-                                'lat': point.latitude,
-                                'lon': point.longitude,
-                                'ele': point.elevation,
-                                'time': point.time
-                            })
+            try:
+                self.points = self._stream_points()
+            except (ET.ParseError, ValueError, TypeError) as e:
+                logger.debug(f"Streaming parse failed ({e}), retrying with gpxpy")
+                self.points = self._gpxpy_points()
 
             if not self.points:
                 logger.warning(f"No track points found in {self.file_path}")
@@ -94,6 +108,76 @@ class GPXHandler:
             logger.error(f"Error parsing GPX file: {e}")
             sys.exit(1)
 
+    def _stream_points(self) -> List[Dict[str, Any]]:
+        """
+        Extract track points by streaming <trkpt> elements
+        
+        Every element is detached from its parent once processed (children
+        of <trkpt> once the point is read), so the tree never grows beyond
+        the current point.
+        
+        Returns:
+            A list of track points
+        """
+        points = []
+        # Local names of the open elements, parallel to their Element objects
+        open_elems: List[ET.Element] = []
+        open_names: List[str] = []
+        for event, elem in ET.iterparse(self.file_path, events=('start', 'end')):
+            if event == 'start':
+                open_elems.append(elem)
+                open_names.append(elem.tag.rpartition('}')[2])
+                continue
+
+            open_elems.pop()
+            if open_names.pop() == 'trkpt':
+                ele = None
+                point_time = None
+                for child in elem:
+                    child_name = child.tag.rpartition('}')[2]
+                    if child_name == 'ele' and child.text and child.text.strip():
+                        ele = float(child.text)
+                    elif child_name == 'time' and child.text:
+                        point_time = parse_time(child.text)
+                points.append({
+                    'lat': float(elem.get('lat')),
+                    'lon': float(elem.get('lon')),
+                    'ele': ele,
+                    'time': point_time
+                })
+
+            # A point's <ele>/<time> stay attached until the point is read
+            if open_elems and open_names[-1] != 'trkpt':
+                open_elems[-1].remove(elem)
+        return points
+
+    def _gpxpy_points(self) -> List[Dict[str, Any]]:
+        """
+        Extract track points with gpxpy, for input the streaming parse rejects
+        
+        Returns:
+            A list of track points
+        """
+        try:
+            import gpxpy
+        except ImportError as e:
+            exit_missing_dependency(e)
+
+        with self.file_path.open('r') as gpx_file:
+            gpx = gpxpy.parse(gpx_file)
+
+        return [
+            {
+                'lat': point.latitude,
+                'lon': point.longitude,
+                'ele': point.elevation,
+                'time': point.time
+            }
+            for track in gpx.tracks
+            for segment in track.segments
+            for point in segment.points
+        ]
+
 
 class DeviceManager:
     """
@@ -137,10 +221,16 @@ class DeviceManager:
         """
         Connect via Remote Service Discovery (RSD) for iOS 17+
         """
-        logger.info(f"Connecting via RSD: {self.rsd_address}:{self.rsd_port}...")
         try:
+            from pymobiledevice3.remote.remote_service_discovery import RemoteServiceDiscoveryService
+            from pymobiledevice3.services.dvt.dvt_secure_socket_proxy import DvtSecureSocketProxyService
+            from pymobiledevice3.services.dvt.instruments.location_simulation import LocationSimulation
             from pymobiledevice3.utils import get_asyncio_loop
+        except ImportError as e:
+            exit_missing_dependency(e)
 
+        logger.info(f"Connecting via RSD: {self.rsd_address}:{self.rsd_port}...")
+        try:
             rsd = RemoteServiceDiscoveryService((self.rsd_address, int(self.rsd_port)))
             get_asyncio_loop().run_until_complete(rsd.connect())
 
@@ -163,9 +253,14 @@ class DeviceManager:
         """
         Connect via tunneld daemon
         """
-        logger.info("Attempting to connect via tunneld daemon...")
         try:
             from pymobiledevice3.exceptions import TunneldConnectionError
+            from pymobiledevice3.tunneld.api import get_tunneld_devices
+        except ImportError as e:
+            exit_missing_dependency(e)
+
+        logger.info("Attempting to connect via tunneld daemon...")
+        try:
             devices = get_tunneld_devices()
             if not devices:
                 logger.error("No devices found via tunneld daemon")
@@ -190,6 +285,16 @@ class DeviceManager:
         """
         Connect via USB (legacy method)
         """
+        try:
+            from pymobiledevice3.exceptions import InvalidServiceError
+            from pymobiledevice3.lockdown import create_using_usbmux
+            from pymobiledevice3.services.dvt.dvt_secure_socket_proxy import DvtSecureSocketProxyService
+            from pymobiledevice3.services.dvt.instruments.location_simulation import LocationSimulation
+            from pymobiledevice3.services.simulate_location import DtSimulateLocation
+            from pymobiledevice3.usbmux import list_devices
+        except ImportError as e:
+            exit_missing_dependency(e)
+
         devices = list_devices()
         if not devices:
             logger.error("No iOS devices found via USB")
@@ -266,6 +371,9 @@ class LocationSimulator:
     Handles the iteration over GPX points, time delays, and jitter application
     """
 
+    # Magnitude of the random anti-cheat noise added to each coordinate
+    JITTER_STRENGTH = 0.00002
+
     def __init__(self, device_manager: DeviceManager, points: List[Dict[str, Any]]):
         """
         Initialize LocationSimulator
@@ -278,19 +386,6 @@ class LocationSimulator:
         self.points = points
         self.running = False
 
-    def _add_jitter(self, value: float, strength: float = 0.00002) -> float:
-        """
-        Add random noise to a coordinate value for anti-cheat purposes
-        
-        Args:
-            value: The coordinate value
-            strength: The magnitude of the random noise
-            
-        Returns:
-            The coordinate value with added jitter
-        """
-        return value + random.uniform(-strength, strength)
-
     def _calculate_sleep_time(self, current_point_idx: int) -> float:
         """
         Calculate the time to wait before moving to the next point
@@ -324,21 +419,29 @@ class LocationSimulator:
         self.running = True
         logger.info("Starting simulation...")
 
+        # Hot-loop names bound once as locals
+        uniform = random.uniform
+        strength = self.JITTER_STRENGTH if use_jitter else 0.0
+        points = self.points
+        num_points = len(points)
+        update = self.device_manager.update_location
+        sleep = time.sleep
+
         try:
             while self.running:
-                for i, point in enumerate(self.points):
-                    lat = self._add_jitter(point['lat'], strength=0.00002) if use_jitter else point['lat']
-                    lon = self._add_jitter(point['lon'], strength=0.00002) if use_jitter else point['lon']
+                for i, point in enumerate(points):
+                    lat = point['lat'] + uniform(-strength, strength) if use_jitter else point['lat']
+                    lon = point['lon'] + uniform(-strength, strength) if use_jitter else point['lon']
 
-                    self.device_manager.update_location(lat, lon)
+                    update(lat, lon)
 
                     sleep_time = self._calculate_sleep_time(i)
-                    logger.info(f"Point {i + 1}/{len(self.points)} -> "
+                    logger.info(f"Point {i + 1}/{num_points} -> "
                                 f"Lat: {lat:.6f}, Lon: {lon:.6f} | "
                                 f"Sleep: {sleep_time:.2f}s")
 
-                    # Refresh position periodically to prevent drift
-                    self._sleep_with_refresh(sleep_time, lat, lon)
+                    # The simulated location holds until the next update
+                    sleep(sleep_time)
 
                 if not loop:
                     logger.info("Route completed")
@@ -350,24 +453,6 @@ class LocationSimulator:
         finally:
             self.device_manager.stop()
 
-    def _sleep_with_refresh(self, total_sleep_time: float, lat: float, lon: float) -> None:
-        """
-        Sleep for a given duration while periodically refreshing the location
-        
-        Args:
-            total_sleep_time: The total time to sleep
-            lat: The latitude to refresh
-            lon: The longitude to refresh
-        """
-        refresh_interval = 0.5
-        elapsed = 0
-        while elapsed < total_sleep_time:
-            wait_time = min(refresh_interval, total_sleep_time - elapsed)
-            time.sleep(wait_time)
-            elapsed += wait_time
-            if elapsed < total_sleep_time:
-                self.device_manager.update_location(lat, lon)
-
 
 def main():
     """
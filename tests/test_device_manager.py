@@ -0,0 +1,205 @@
+"""Tests for device control and the device database."""
+
+import asyncio
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import device_manager
+from core.device_manager import (
+    ANDROID_SHELL_DONE,
+    ANDROID_SHELL_DONE_CMD,
+    AndroidDevice,
+    DevicePool,
+    IOSDevice,
+)
+
+
+class SlowLocationService:
+    """Location service whose set() takes a while; logs call boundaries."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _log(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def set(self, lat, lon):
+        self._log("set-start")
+        time.sleep(self.delay)
+        self._log("set-end")
+
+    def clear(self):
+        self._log("clear")
+
+
+def test_ios_disconnect_waits_for_cancelled_update():
+    """A cancelled update's worker thread finishes before clear() runs."""
+    device = IOSDevice("00008030-TEST", persisted=(None, None))
+    service = SlowLocationService(0.3)
+    device._service = service
+    device.connected = True
+
+    async def scenario():
+        update = asyncio.create_task(device.set_location_async(1.0, 2.0))
+        await asyncio.sleep(0.05)
+        update.cancel()
+        await asyncio.to_thread(device.disconnect)
+
+    asyncio.run(scenario())
+    assert service.events == ["set-start", "set-end", "clear"]
+    assert device.connected is False
+
+
+class CountingDevice:
+    """Device stand-in that counts connect() calls."""
+
+    def __init__(self, udid):
+        self.udid = udid
+        self.connected = False
+        self.connects = 0
+
+    async def connect(self):
+        self.connects += 1
+        await asyncio.sleep(0)
+        self.connected = True
+
+
+def test_connect_all_connects_repeated_udid_once():
+    pool = DevicePool.__new__(DevicePool)
+    pool.devices = {"a": CountingDevice("a"), "b": CountingDevice("b")}
+
+    failures = asyncio.run(pool.connect_all(["a", "b", "a"]))
+    assert failures == {}
+    assert pool.devices["a"].connects == 1
+    assert pool.devices["b"].connects == 1
+
+
+class ScriptedSocket:
+    """Socket stand-in returning queued recv() chunks; b"" signals EOF."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.sent = b""
+
+    def sendall(self, data):
+        self.sent += data
+
+    def recv(self, size):
+        return self.chunks.pop(0)
+
+
+def android_with_socket(sock, close=lambda: None):
+    device = AndroidDevice("emulator-5554", adb_client=None, persisted=(None, None))
+    device._shell_conn = SimpleNamespace(socket=sock, close=close)
+    device.connected = True
+    return device
+
+
+def test_write_shell_matches_marker_split_across_chunks():
+    half = len(ANDROID_SHELL_DONE) // 2
+    sock = ScriptedSocket([
+        b"am startservice ...; echo __OMNI_\"\"DONE__\r\nStarting service\r\n",
+        ANDROID_SHELL_DONE[:half],
+        ANDROID_SHELL_DONE[half:] + b"\r\n$ ",
+    ])
+    device = android_with_socket(sock)
+
+    device._write_shell("am startservice")
+    assert sock.chunks == []
+    assert sock.sent.endswith(ANDROID_SHELL_DONE_CMD.encode())
+    # The echoed command line alone does not count as completion
+    assert ANDROID_SHELL_DONE not in sock.sent
+
+
+def test_write_shell_raises_on_eof():
+    device = android_with_socket(ScriptedSocket([b"Starting service\r\n", b""]))
+    with pytest.raises(ConnectionError):
+        device._write_shell("am startservice")
+
+
+def test_android_disconnect_does_not_wait_for_in_flight_command():
+    device_end, shell_end = socket.socketpair()
+    device = android_with_socket(device_end, close=device_end.close)
+    result = []
+    worker = threading.Thread(
+        target=lambda: result.append(device._try_write_shell("am startservice"))
+    )
+    worker.start()
+    shell_end.recv(4096)  # The command has been sent; the worker waits in recv
+
+    start = time.monotonic()
+    device.disconnect()
+    assert time.monotonic() - start < 1.0
+    worker.join(timeout=2.0)
+
+    assert result == [False]
+    assert device._shell_conn is None
+    assert device.connected is False
+    shell_end.close()
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    """A devices.db in the pre-migration layout: TEXT timestamps, no service_kind."""
+    path = tmp_path / "devices.db"
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            """
+            CREATE TABLE devices (
+                udid TEXT PRIMARY KEY,
+                real_name TEXT,
+                custom_name TEXT,
+                last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO devices (udid, real_name, custom_name, last_seen) VALUES (?, ?, ?, ?)",
+            [
+                ("udid-1", "iPhone", "Work phone", "2024-05-01 08:00:00"),
+                ("udid-2", "Pixel", None, "2024-05-02 12:30:00"),
+            ],
+        )
+    conn.close()
+
+    monkeypatch.setattr(device_manager, "DB_PATH", str(path))
+    monkeypatch.setattr(device_manager, "_conn", None)
+    monkeypatch.setattr(device_manager, "_db_initialized", False)
+    yield path
+    device_manager._close_conn()
+
+
+def test_init_db_migrates_legacy_table(legacy_db):
+    device_manager.init_db()
+
+    conn = sqlite3.connect(legacy_db)
+    try:
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(devices)")}
+        rows = conn.execute(
+            "SELECT udid, real_name, custom_name, last_seen, typeof(last_seen), service_kind"
+            " FROM devices ORDER BY udid"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert columns["last_seen"] == "INTEGER"
+    assert "service_kind" in columns
+    assert rows == [
+        ("udid-1", "iPhone", "Work phone", 1714550400, "integer", None),
+        ("udid-2", "Pixel", None, 1714653000, "integer", None),
+    ]
+    assert device_manager.get_device_info_from_db("udid-1") == ("iPhone", "Work phone")
@@ -1,12 +1,14 @@
-"""Test script to verify the unified error handling system.
+"""Tests for the unified error handling system.
 
-This script demonstrates how the new exception classes work and can be used
-to test API error responses.
+Each case constructs an exception and checks the status code and error
+code it serializes to in API error responses.
 """
 
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -27,123 +29,26 @@ from core.exceptions import (
 )
 
 
-def test_validation_error():
-    """Test ValidationError exception."""
-    print("\n=== Testing ValidationError ===")
-    try:
-        raise ValidationError("Invalid email format", field="email")
-    except ValidationError as e:
-        print(f"Status Code: {e.status_code}")
-        print(f"Error Dict: {e.to_dict()}")
-
-
-def test_resource_not_found():
-    """Test ResourceNotFoundError exception."""
-    print("\n=== Testing ResourceNotFoundError ===")
-    try:
-        raise ResourceNotFoundError("GPX file", "route_test.gpx")
-    except ResourceNotFoundError as e:
-        print(f"Status Code: {e.status_code}")
-        print(f"Error Dict: {e.to_dict()}")
-
-
-def test_device_errors():
-    """Test device-related exceptions."""
-    print("\n=== Testing Device Errors ===")
-    
-    # DeviceNotFoundError
-    try:
-        raise DeviceNotFoundError("abc123def")
-    except DeviceNotFoundError as e:
-        print(f"DeviceNotFoundError: {e.to_dict()}")
-    
-    # DeviceConnectionError
-    try:
-        raise DeviceConnectionError("abc123def", "Connection timeout")
-    except DeviceConnectionError as e:
-        print(f"DeviceConnectionError: {e.to_dict()}")
-    
-    # DeviceControlError
-    try:
-        raise DeviceControlError("abc123def", "set location", "Service unavailable")
-    except DeviceControlError as e:
-        print(f"DeviceControlError: {e.to_dict()}")
-    
-    # NoDevicesAvailableError
-    try:
-        raise NoDevicesAvailableError()
-    except NoDevicesAvailableError as e:
-        print(f"NoDevicesAvailableError: {e.to_dict()}")
-
-
-def test_gpx_errors():
-    """Test GPX-related exceptions."""
-    print("\n=== Testing GPX Errors ===")
-    
-    # GPXParseError
-    try:
-        raise GPXParseError("bad_file.gpx", "Invalid XML format")
-    except GPXParseError as e:
-        print(f"GPXParseError: {e.to_dict()}")
-    
-    # GPXEmptyError
-    try:
-        raise GPXEmptyError("empty_track.gpx")
-    except GPXEmptyError as e:
-        print(f"GPXEmptyError: {e.to_dict()}")
-
-
-def test_simulation_errors():
-    """Test simulation-related exceptions."""
-    print("\n=== Testing Simulation Errors ===")
-    
-    # SimulationAlreadyRunningError
-    try:
-        raise SimulationAlreadyRunningError()
-    except SimulationAlreadyRunningError as e:
-        print(f"SimulationAlreadyRunningError: {e.to_dict()}")
-    
-    # SimulationNotRunningError
-    try:
-        raise SimulationNotRunningError()
-    except SimulationNotRunningError as e:
-        print(f"SimulationNotRunningError: {e.to_dict()}")
-
-
-def test_system_errors():
-    """Test system-level exceptions."""
-    print("\n=== Testing System Errors ===")
-    
-    # DatabaseError
-    try:
-        raise DatabaseError("connection", "Unable to connect to SQLite database")
-    except DatabaseError as e:
-        print(f"DatabaseError: {e.to_dict()}")
-    
-    # ConfigurationError
-    try:
-        raise ConfigurationError("Missing API key: TIANDITU_KEY", config_key="TIANDITU_KEY")
-    except ConfigurationError as e:
-        print(f"ConfigurationError: {e.to_dict()}")
-
-
-def main():
-    """Run all error handling tests."""
-    print("=" * 60)
-    print("OmniLocation Error Handling System Test")
-    print("=" * 60)
-    
-    test_validation_error()
-    test_resource_not_found()
-    test_device_errors()
-    test_gpx_errors()
-    test_simulation_errors()
-    test_system_errors()
-    
-    print("\n" + "=" * 60)
-    print("All tests completed successfully!")
-    print("=" * 60)
-
-
-if __name__ == "__main__":
-    main()
+@pytest.mark.parametrize("exc_factory,expected_status,expected_code", [
+    (lambda: ValidationError("Invalid email format", field="email"), 400, "VALIDATION_ERROR"),
+    (lambda: ResourceNotFoundError("GPX file", "route_test.gpx"), 404, "RESOURCE_NOT_FOUND"),
+    (lambda: InvalidFileError("Invalid file type", filename="route.txt"), 400, "INVALID_FILE"),
+    (lambda: DeviceNotFoundError("abc123def"), 404, "DEVICE_NOT_FOUND"),
+    (lambda: DeviceConnectionError("abc123def", "Connection timeout"), 500, "DEVICE_CONNECTION_ERROR"),
+    (lambda: DeviceControlError("abc123def", "set location", "Service unavailable"), 500, "DEVICE_CONTROL_ERROR"),
+    (lambda: NoDevicesAvailableError(), 500, "NO_DEVICES_AVAILABLE"),
+    (lambda: GPXParseError("bad_file.gpx", "Invalid XML format"), 400, "GPX_PARSE_ERROR"),
+    (lambda: GPXEmptyError("empty_track.gpx"), 400, "GPX_EMPTY"),
+    (lambda: SimulationAlreadyRunningError(), 409, "SIMULATION_ALREADY_RUNNING"),
+    (lambda: SimulationNotRunningError(), 400, "SIMULATION_NOT_RUNNING"),
+    (lambda: DatabaseError("connection", "Unable to connect to SQLite database"), 500, "DATABASE_ERROR"),
+    (lambda: ConfigurationError("Missing API key: TIANDITU_KEY", config_key="TIANDITU_KEY"), 500, "CONFIGURATION_ERROR"),
+])
+def test_exception_to_dict(exc_factory, expected_status, expected_code):
+    """Exceptions serialize their HTTP status and error code."""
+    e = exc_factory()
+    d = e.to_dict()
+    assert e.status_code == expected_status
+    assert d['status'] == expected_status
+    assert d['error'] == expected_code
+    assert d['message'] == e.message
@@ -0,0 +1,118 @@
+"""Tests for GPX parsing, track metrics and the parse cache."""
+
+import math
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import gpxpy
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.gpx_handler import GPXHandler, _parse_time
+
+
+def make_gpx(segments, with_time=True):
+    """Builds GPX XML with one track; segments is a list of (lat, lon) lists."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">',
+        '<metadata><name>test</name></metadata><trk><name>t</name>',
+    ]
+    second = 0
+    for points in segments:
+        parts.append('<trkseg>')
+        for lat, lon in points:
+            parts.append(f'<trkpt lat="{lat}" lon="{lon}"><ele>{10 + second}</ele>')
+            if with_time:
+                parts.append(f'<time>2024-05-01T08:{second // 60:02d}:{second % 60:02d}Z</time>')
+            parts.append('</trkpt>')
+            second += 7
+        parts.append('</trkseg>')
+    parts.append('</trk></gpx>')
+    return ''.join(parts)
+
+
+# Two segments: a dense walk, then points far enough apart for haversine
+SEGMENTS = [
+    [(31.2304 + i * 0.0004, 121.4737 + i * 0.0003) for i in range(40)],
+    [(31.5 + i * 0.3, 121.9 - i * 0.25) for i in range(5)],
+]
+
+
+@pytest.fixture
+def gpx_file(tmp_path):
+    path = tmp_path / "route.gpx"
+    path.write_text(make_gpx(SEGMENTS), encoding="utf-8")
+    return path
+
+
+def test_stream_parse_matches_gpxpy(gpx_file):
+    """The streaming parser and the gpxpy fallback agree on every column."""
+    handler = GPXHandler(str(gpx_file))
+    stream = handler._stream_parse()
+    fallback = handler._gpxpy_parse()
+    with gpx_file.open(encoding="utf-8") as f:
+        reference = gpxpy.parse(f)
+
+    assert list(stream["lats"]) == list(fallback["lats"])
+    assert list(stream["lons"]) == list(fallback["lons"])
+    assert list(stream["eles"]) == list(fallback["eles"])
+    assert list(stream["timestamps"]) == list(fallback["timestamps"])
+    assert stream["has_timestamps"] is fallback["has_timestamps"] is True
+    assert stream["total_duration"] == fallback["total_duration"] == reference.get_duration()
+
+
+def test_stream_parse_timestamps_are_utc(gpx_file):
+    data = GPXHandler(str(gpx_file))._stream_parse()
+    assert data["times"][0] == datetime(2024, 5, 1, 8, 0, 0, tzinfo=timezone.utc)
+    assert data["timestamps"][1] - data["timestamps"][0] == 7.0
+
+
+@pytest.mark.parametrize("text", [
+    "2024-05-01T08:00:00Z",
+    "2024-05-01T08:00:00z",
+    " 2024-05-01T08:00:00+00:00\n",
+])
+def test_parse_time_accepts_utc_suffixes(text):
+    assert _parse_time(text) == datetime(2024, 5, 1, 8, 0, 0, tzinfo=timezone.utc)
+
+
+def test_parse_is_cached_until_file_changes(gpx_file):
+    first = GPXHandler(str(gpx_file)).parse()
+    again = GPXHandler(str(gpx_file)).parse()
+    assert again["lats"] is first["lats"]
+
+    gpx_file.write_text(make_gpx([SEGMENTS[0][:10]]), encoding="utf-8")
+    changed = GPXHandler(str(gpx_file)).parse()
+    assert len(changed["lats"]) == 10
+    assert len(first["lats"]) == len(SEGMENTS[0]) + len(SEGMENTS[1])
+
+
+def test_track_length_matches_gpxpy(gpx_file):
+    """Distances follow gpxpy.length_2d, flat-earth and haversine pairs alike."""
+    handler = GPXHandler(str(gpx_file))
+    stream = handler._stream_parse()
+    fallback = handler._gpxpy_parse()
+    with gpx_file.open(encoding="utf-8") as f:
+        reference = gpxpy.parse(f)
+
+    assert list(stream["distances"]) == pytest.approx(list(fallback["distances"]))
+    assert stream["total_distance"] == pytest.approx(reference.length_2d(), rel=1e-12)
+
+
+def test_segment_gap_is_not_counted(gpx_file):
+    data = GPXHandler(str(gpx_file)).parse()
+    first_segment_end = len(SEGMENTS[0]) - 1
+    assert data["distances"][first_segment_end + 1] == data["distances"][first_segment_end]
+
+
+def test_stream_parse_without_timestamps(tmp_path):
+    path = tmp_path / "untimed.gpx"
+    path.write_text(make_gpx(SEGMENTS, with_time=False), encoding="utf-8")
+    data = GPXHandler(str(path))._stream_parse()
+    assert data["has_timestamps"] is False
+    assert data["total_duration"] == 0.0
+    assert all(math.isnan(t) for t in data["timestamps"])
@@ -0,0 +1,82 @@
+"""Tests for playback timing in the simulator."""
+
+import asyncio
+import math
+import sys
+from array import array
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.simulator import Simulator
+
+
+class FakeDevice:
+    """Records the track index of every update; each update takes `lag` seconds."""
+
+    def __init__(self, lag=0.0):
+        self.lag = lag
+        self.indices = []
+
+    async def set_location_async(self, lat, lon):
+        # Track latitudes are the point indices; jitter is far below 0.5
+        self.indices.append(round(lat))
+        if self.lag:
+            await asyncio.sleep(self.lag)
+        else:
+            await asyncio.sleep(0)
+
+
+def make_track(delays):
+    """Builds a track whose point i has latitude i and the given gaps."""
+    timestamps = array("d", [0.0])
+    for delay in delays:
+        timestamps.append(timestamps[-1] + delay)
+    n = len(timestamps)
+    return {
+        "lats": array("d", range(n)),
+        "lons": array("d", [0.0] * n),
+        "timestamps": timestamps,
+        "has_timestamps": True,
+    }
+
+
+def play(track, device, speed=1.0):
+    simulator = Simulator(device_pool=None)
+    asyncio.run(simulator._run_loop(track, [device], False, speed))
+    return simulator
+
+
+def test_build_delays_from_timestamps():
+    delays = Simulator._build_delays(array("d", [0.0, 2.0, 5.0]), True, 1.0, 2.0)
+    assert list(delays) == [1.0, 1.5, 1.0]
+
+
+def test_build_delays_clamps_out_of_range_gaps():
+    timestamps = array("d", [0.0, 1000.0, 999.0, 1001.0])
+    delays = Simulator._build_delays(timestamps, True, 1.0, 1.0)
+    assert list(delays) == [5.0, 0.0, 2.0, 1.0]
+
+
+def test_build_delays_without_timestamps_uses_constant():
+    timestamps = array("d", [math.nan] * 3)
+    assert list(Simulator._build_delays(timestamps, False, 0.25, 4.0)) == [0.25] * 3
+
+
+def test_every_point_is_sent_when_on_schedule():
+    device = FakeDevice()
+    simulator = play(make_track([0.001] * 9), device)
+    assert device.indices == list(range(10))
+    assert simulator.status["running"] is False
+
+
+def test_slow_device_skips_stale_points():
+    # Each update takes 20 ms, points are due every 2 ms
+    device = FakeDevice(lag=0.02)
+    play(make_track([0.002] * 39), device)
+
+    assert device.indices[0] == 0
+    assert device.indices[-1] == 39
+    assert device.indices == sorted(set(device.indices))
+    assert len(device.indices) < 20
@@ -0,0 +1,164 @@
+"""Tests for the GPX file endpoints: lookup, HTTP caching and content negotiation."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from web import app as web_app
+
+GPX = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">'
+    '<trk><trkseg>'
+    '<trkpt lat="31.23" lon="121.47"><time>2024-05-01T08:00:00Z</time></trkpt>'
+    '<trkpt lat="31.24" lon="121.48"><time>2024-05-01T08:01:00Z</time></trkpt>'
+    '</trkseg></trk></gpx>'
+)
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_app, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(web_app, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(web_app, "_gpx_list_cache", None)
+    monkeypatch.setattr(web_app, "_gpx_list_generation", 0)
+    (tmp_path / "route.gpx").write_text(GPX, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def client(upload_dir, monkeypatch):
+    # Templates and static files are resolved relative to the repo root.
+    # The lifespan (device pool, background tasks) is not started.
+    monkeypatch.chdir(ROOT)
+    return TestClient(web_app.create_app())
+
+
+def test_details_missing_file_is_404(client):
+    resp = client.get("/api/gpx_files/missing.gpx/details")
+    assert resp.status_code == 404
+    assert resp.json()["error"] == "RESOURCE_NOT_FOUND"
+
+
+def test_details_etag_and_304(client):
+    url = "/api/gpx_files/route.gpx/details"
+    resp = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.json()["point_count"] == 2
+    etag = resp.headers["etag"]
+
+    resp = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_details_etag_changes_with_file(client, upload_dir):
+    url = "/api/gpx_files/route.gpx/details"
+    etag = client.get(url, headers={"Accept-Encoding": "identity"}).headers["etag"]
+    path = upload_dir / "route.gpx"
+    st = path.stat()
+    path.write_text(GPX.replace("31.24", "31.25"), encoding="utf-8")
+    # Same size; make sure the mtime moves even on coarse-grained filesystems
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    resp = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["points"][1]["lat"] == 31.25
+
+
+def test_gpx_list_etag_and_304(client, upload_dir):
+    resp = client.get("/api/gpx_files")
+    assert resp.status_code == 200
+    assert resp.json() == ["route.gpx"]
+    etag = resp.headers["etag"]
+
+    resp = client.get("/api/gpx_files", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+def test_gpx_list_etag_changes_when_file_added(client, upload_dir):
+    etag = client.get("/api/gpx_files").headers["etag"]
+    (upload_dir / "other.gpx").write_text(GPX, encoding="utf-8")
+    # Make sure the folder mtime moves even on coarse-grained filesystems
+    st = os.stat(upload_dir)
+    os.utime(upload_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    resp = client.get("/api/gpx_files", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert sorted(resp.json()) == ["other.gpx", "route.gpx"]
+
+
+def test_gpx_list_etag_changes_within_one_mtime_tick(client, upload_dir):
+    """An upload that leaves the folder mtime unchanged still changes the ETag."""
+    etag = client.get("/api/gpx_files").headers["etag"]
+    st = os.stat(upload_dir)
+    (upload_dir / "other.gpx").write_text(GPX, encoding="utf-8")
+    os.utime(upload_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+    web_app._invalidate_gpx_list()
+
+    resp = client.get("/api/gpx_files", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert sorted(resp.json()) == ["other.gpx", "route.gpx"]
+
+
+def test_details_identity_response_varies_on_encoding(client):
+    resp = client.get(
+        "/api/gpx_files/route.gpx/details", headers={"Accept-Encoding": "identity"}
+    )
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.json()["point_count"] == 2
+    etag = resp.headers["etag"]
+    assert not etag.endswith('-gz"')
+
+    resp = client.get(
+        "/api/gpx_files/route.gpx/details",
+        headers={"Accept-Encoding": "identity", "If-None-Match": etag},
+    )
+    assert resp.status_code == 304
+    assert resp.headers["vary"] == "Accept-Encoding"
+
+
+def test_details_gzip_has_its_own_etag(client):
+    url = "/api/gpx_files/route.gpx/details"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    resp = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.headers["etag"].endswith('-gz"')
+    assert resp.headers["etag"] != plain.headers["etag"]
+    assert resp.json() == plain.json()
+
+    # The identity validator does not match the gzip representation
+    resp = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["etag"]}
+    )
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("GZIP;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, identity", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("br, *;q=0.1", True),
+    ("deflate, br", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert web_app._accepts_gzip(header) is expected
@@ -1,14 +1,20 @@
 """FastAPI application factory for the OmniLocation Web UI."""
 
 import asyncio
+import functools
+import gzip
 import logging
+import operator
 import os
 import shutil
+import stat
+import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, Request, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
@@ -21,12 +27,23 @@ from core.exceptions import (
     InvalidFileError,
     GPXParseError,
 )
-from core.gpx_handler import GPXHandler
+from core.gpx_handler import GPXHandler, iter_track_points
 from core.simulator import Simulator
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
+UPLOAD_DIR = Path(UPLOAD_FOLDER)
 ALLOWED_EXTENSIONS = {'gpx'}
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
+UPLOAD_COPY_BUFSIZE = 1024 * 1024  # bytes per read when saving uploads
+STATUS_CACHE_TTL = 0.2  # seconds an encoded /api/status body is reused
+DEVICE_SCAN_TTL = 0.5  # seconds a device scan result is reused
+INDEX_CACHE_SIZE = 16  # distinct base URLs with a cached dashboard page
+DETAILS_GZIP_LEVEL = 6  # zlib level for cached /details bodies
+
+# Device attributes listed by /api/devices, in response key order
+_DEVICE_FIELD_NAMES = ('udid', 'name', 'real_name', 'device_type', 'connection_type', 'connected')
+_device_fields = operator.attrgetter(*_DEVICE_FIELD_NAMES)
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +53,12 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # Templates
 templates = Jinja2Templates(directory="web/templates")
 
+# (upload folder mtime_ns, .gpx names) from the last directory scan
+_gpx_list_cache: Optional[Tuple[int, List[str]]] = None
+# Bumped on every upload/delete; part of the /api/gpx_files ETag, since
+# two changes can share one folder mtime tick on coarse filesystems
+_gpx_list_generation = 0
+
 
 # --- WebSocket Manager ---
 
@@ -81,7 +104,145 @@ class StartSimulationRequest(BaseModel):
 
 def allowed_file(filename: str) -> bool:
     """Checks if the file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+@functools.lru_cache(maxsize=32)
+def _gpx_details_json(filepath: str, mtime_ns: int, size: int) -> bytes:
+    """Builds the encoded /details response body for a GPX file.
+
+    Memoized on the file's stat fields, so repeated requests for an
+    unchanged file skip the per-point serialization as well as the parse.
+
+    Args:
+        filepath: Path to the GPX file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The JSON body, encoded the same way as JSONResponse.
+    """
+    data = GPXHandler(filepath).parse()
+    points = [
+        {**point, 'time': point['time'].isoformat() if point['time'] else None}
+        for point in iter_track_points(data)
+    ]
+    return JSONResponse(content={
+        'filename': os.path.basename(filepath),
+        'total_distance': data['total_distance'],
+        'total_duration': data['total_duration'],
+        'point_count': len(data['lats']),
+        'points': points
+    }).body
+
+
+@functools.lru_cache(maxsize=32)
+def _gpx_details_gzip(filepath: str, mtime_ns: int, size: int) -> bytes:
+    """Gzip-compresses the /details body for a GPX file.
+
+    Memoized like _gpx_details_json, so each file version is compressed
+    once rather than on every request.
+    """
+    return gzip.compress(
+        _gpx_details_json(filepath, mtime_ns, size), compresslevel=DETAILS_GZIP_LEVEL
+    )
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Checks whether an Accept-Encoding header allows a gzip response.
+
+    An explicit gzip entry takes precedence over a '*' wildcard, and a
+    q-value of 0 refuses the coding.
+
+    Args:
+        accept_encoding: The raw header value; empty if absent.
+
+    Returns:
+        True if gzip has a positive q-value.
+    """
+    gzip_q = wildcard_q = None
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if coding not in ('gzip', 'x-gzip', '*'):
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == '*':
+            wildcard_q = q
+        else:
+            gzip_q = q
+    q = gzip_q if gzip_q is not None else wildcard_q
+    return q is not None and q > 0
+
+
+def _resolve_gpx(filename: str) -> Tuple[Path, os.stat_result]:
+    """Locates an uploaded GPX file.
+
+    Directory components are stripped from the name to prevent traversal
+    outside the upload folder.
+
+    Args:
+        filename: User-supplied file name.
+
+    Returns:
+        The file's path and its stat result, from a single stat call.
+
+    Raises:
+        ResourceNotFoundError: If no such regular file exists.
+    """
+    filename = os.path.basename(filename)
+    path = UPLOAD_DIR / filename
+    try:
+        st = path.stat()
+    except OSError:
+        raise ResourceNotFoundError('GPX file', filename)
+    if not stat.S_ISREG(st.st_mode):
+        raise ResourceNotFoundError('GPX file', filename)
+    return path, st
+
+
+def _list_gpx_files() -> List[str]:
+    """Lists .gpx files in the upload folder.
+
+    The scan is reused until the folder's mtime changes or the cache is
+    reset by an upload or delete.
+    """
+    global _gpx_list_cache
+    try:
+        mtime_ns = os.stat(UPLOAD_FOLDER).st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    if _gpx_list_cache is not None and _gpx_list_cache[0] == mtime_ns:
+        return _gpx_list_cache[1]
+
+    with os.scandir(UPLOAD_FOLDER) as entries:
+        files = [
+            entry.name for entry in entries
+            if entry.name.endswith('.gpx') and entry.is_file(follow_symlinks=False)
+        ]
+    _gpx_list_cache = (mtime_ns, files)
+    return files
+
+
+def _save_upload(src: BinaryIO, filepath: Path) -> None:
+    """Copies an uploaded file's contents to disk in large chunks."""
+    with open(filepath, "wb") as buffer:
+        shutil.copyfileobj(src, buffer, UPLOAD_COPY_BUFSIZE)
+
+
+def _invalidate_gpx_list() -> None:
+    """Forces the next _list_gpx_files call to rescan the folder."""
+    global _gpx_list_cache, _gpx_list_generation
+    _gpx_list_cache = None
+    _gpx_list_generation += 1
 
 
 async def broadcast_status_loop(simulator: Simulator):
@@ -118,20 +279,23 @@ async def lifespan(app: FastAPI):
     
     logger.info("Core components initialized.")
     
-    # 2. Start Broadcast Task
+    # 2. Start Background Tasks
     broadcast_task = asyncio.create_task(broadcast_status_loop(simulator))
+    wal_task = asyncio.create_task(device_pool.wal_maintenance_loop())
     
     yield  # Application runs here
     
     # 3. Cleanup
     logger.info("Shutting down core components...")
-    broadcast_task.cancel()
-    try:
-        await broadcast_task
-    except asyncio.CancelledError:
-        pass
+    for task in (broadcast_task, wal_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
         
     await simulator.stop()
+    await device_pool.close()
 
 
 # --- Application Factory ---
@@ -149,6 +313,27 @@ def create_app() -> FastAPI:
     # Mount static files
     app.mount("/static", StaticFiles(directory="web/static"), name="static")
 
+    # Encoded /api/status body shared by all pollers until it expires
+    status_body = b''
+    status_expires = 0.0
+
+    def invalidate_status() -> None:
+        """Makes the next /api/status request re-encode the status."""
+        nonlocal status_expires
+        status_expires = 0.0
+
+    # Rendered dashboard per base URL; the key is fixed for the process
+    tianditu_key = os.getenv("TIANDITU_KEY", "")
+    index_pages: Dict[str, str] = {}
+
+    # Last device scan, shared by concurrent /api/devices requests
+    scan_lock = asyncio.Lock()
+    scan_devices: List[Any] = []
+    scan_expires = 0.0
+    # Encoded device list and the field values it was built from
+    devices_key: Optional[Tuple[Any, ...]] = None
+    devices_body = b''
+
     # --- Exception Handlers ---
 
     @app.exception_handler(OmniLocationError)
@@ -189,37 +374,52 @@ def create_app() -> FastAPI:
 
     @app.get("/", response_class=HTMLResponse)
     async def index(request: Request):
-        """Renders the main dashboard page."""
-        tianditu_key = os.getenv("TIANDITU_KEY", "")
-        return templates.TemplateResponse(
-            "index.html", 
-            {"request": request, "tianditu_key": tianditu_key}
-        )
+        """Renders the main dashboard page.
+
+        Asset links are absolute, so the page depends on the base URL the
+        client used (e.g. localhost vs. a LAN address) and is cached per
+        base URL. The cache is bounded because the Host header is
+        client-controlled.
+        """
+        base_url = str(request.base_url)
+        html = index_pages.get(base_url)
+        if html is None:
+            if len(index_pages) >= INDEX_CACHE_SIZE:
+                index_pages.clear()
+            html = templates.get_template("index.html").render(
+                {"request": request, "tianditu_key": tianditu_key}
+            )
+            index_pages[base_url] = html
+        return HTMLResponse(content=html)
 
     @app.get("/api/devices")
-    async def list_devices():
-        """Lists connected devices after triggering a scan."""
+    async def list_devices() -> Response:
+        """Lists connected devices after triggering a scan.
+
+        Requests arriving while a scan runs, or within DEVICE_SCAN_TTL of
+        it finishing, share its result instead of enumerating again. The
+        JSON is re-encoded only when a listed field changes.
+        """
+        nonlocal scan_devices, scan_expires, devices_key, devices_body
         device_pool: DevicePool = app.state.device_pool
         
-        # Run synchronous scan in a separate thread to avoid blocking the simulation loop
-        loop = asyncio.get_running_loop()
-        devices = await loop.run_in_executor(None, device_pool.scan_usb_devices)
+        async with scan_lock:
+            if time.monotonic() >= scan_expires:
+                # Run synchronous scan in a separate thread to avoid blocking the simulation loop
+                loop = asyncio.get_running_loop()
+                scan_devices = await loop.run_in_executor(None, device_pool.scan_usb_devices)
+                scan_expires = time.monotonic() + DEVICE_SCAN_TTL
+            devices = scan_devices
         
-        dev_list = []
-        for d in devices:
-            device_type = 'iOS' if d.__class__.__name__ == 'IOSDevice' else 'Android'
-            dev_list.append({
-                'udid': d.udid,
-                'name': d.name,
-                'real_name': d.real_name,
-                'device_type': device_type,
-                'connection_type': d.connection_type,
-                'connected': d.connected
-            })
-        return dev_list
+        key = tuple(map(_device_fields, devices))
+        if key != devices_key:
+            dev_list = [dict(zip(_DEVICE_FIELD_NAMES, fields)) for fields in key]
+            devices_body = JSONResponse(content=dev_list).body
+            devices_key = key
+        return Response(content=devices_body, media_type='application/json')
 
     @app.post("/api/devices/rename")
-    async def rename_device(req: RenameDeviceRequest):
+    async def rename_device(req: RenameDeviceRequest) -> Dict[str, str]:
         """Renames a device."""
         device_pool: DevicePool = app.state.device_pool
         success = device_pool.rename_device(req.udid, req.name)
@@ -229,24 +429,27 @@ def create_app() -> FastAPI:
             raise ResourceNotFoundError('Device', req.udid)
 
     @app.post("/api/upload")
-    async def upload_file(file: UploadFile = File(...)):
+    async def upload_file(file: UploadFile = File(...)) -> Dict[str, str]:
         """Handles GPX file uploads."""
-        if not file.filename:
+        # Simple security check (FastAPI UploadFile.filename is user-provided)
+        filename = os.path.basename(file.filename or '')
+        if not filename:
             raise ValidationError('No file selected', field='file')
         
-        if not allowed_file(file.filename):
+        if not allowed_file(filename):
             raise InvalidFileError('Only .gpx files are allowed', filename=file.filename)
         
-        # Simple security check (FastAPI UploadFile.filename is user-provided)
-        filename = os.path.basename(file.filename) 
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        filepath = UPLOAD_DIR / filename
         
         try:
-            with open(filepath, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # Disk writes run in a worker thread so the event loop keeps
+            # serving other requests and the simulation during the copy
+            await asyncio.to_thread(_save_upload, file.file, filepath)
         except Exception as e:
             logger.error("Failed to save file %s: %s", filename, e)
             raise InvalidFileError(f'Failed to save file: {str(e)}', filename=filename)
+        finally:
+            _invalidate_gpx_list()
             
         return {
             'message': 'File uploaded successfully',
@@ -254,101 +457,128 @@ def create_app() -> FastAPI:
         }
 
     @app.get("/api/gpx_files")
-    async def list_gpx_files():
-        """Lists available GPX files."""
-        files = []
-        if os.path.exists(UPLOAD_FOLDER):
-            files = [
-                f for f in os.listdir(UPLOAD_FOLDER)
-                if f.endswith('.gpx')
-            ]
-        return files
+    async def list_gpx_files(request: Request) -> Response:
+        """Lists available GPX files.
+
+        The ETag combines the upload folder's mtime, which changes whenever
+        a file is added or removed, with a counter bumped by every upload
+        and delete, so an unchanged listing gets an empty 304.
+        """
+        files = _list_gpx_files()
+        if _gpx_list_cache is None:
+            return JSONResponse(content=files)
+
+        headers = {
+            'ETag': f'"{_gpx_list_generation:x}-{_gpx_list_cache[0]:x}"',
+            'Cache-Control': 'no-cache',
+        }
+        if request.headers.get('if-none-match') == headers['ETag']:
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(content=files, headers=headers)
 
     @app.delete("/api/gpx_files/{filename}")
-    async def delete_gpx_file(filename: str):
-        """Deletes a GPX file."""
-        # Prevent directory traversal
+    async def delete_gpx_file(filename: str) -> Dict[str, Any]:
+        """Deletes a GPX file.
+
+        The file is removed without a prior stat; a missing file is
+        reported by os.remove itself.
+        """
         filename = os.path.basename(filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        
-        if not os.path.exists(filepath):
+        if not filename:
             raise ResourceNotFoundError('GPX file', filename)
         
         try:
-            os.remove(filepath)
+            os.remove(UPLOAD_DIR / filename)
+            _invalidate_gpx_list()
             return {'success': True, 'message': f'Deleted {filename}'}
+        except (FileNotFoundError, IsADirectoryError):
+            raise ResourceNotFoundError('GPX file', filename)
         except Exception as e:
             logger.error("Failed to delete file %s: %s", filename, e)
             raise InvalidFileError(f'Failed to delete file: {str(e)}', filename=filename)
 
     @app.get("/api/gpx_files/{filename}/details")
-    async def get_gpx_details(filename: str):
-        """Gets metadata for a specific GPX file."""
-        filename = os.path.basename(filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        
-        if not os.path.exists(filepath):
-            raise ResourceNotFoundError('GPX file', filename)
+    async def get_gpx_details(filename: str, request: Request) -> Response:
+        """Gets metadata for a specific GPX file.
+
+        The response carries an ETag derived from the file version and the
+        content encoding, so a client re-selecting an unchanged track gets
+        an empty 304. Clients accepting gzip get a body compressed once per
+        file version.
+        """
+        filepath, st = _resolve_gpx(filename)
+        filename = filepath.name
+
+        use_gzip = _accepts_gzip(request.headers.get('accept-encoding', ''))
+        # Each encoding is a distinct representation with its own ETag
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if use_gzip else ""}"'
+        headers = {
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
 
         try:
-            handler = GPXHandler(filepath)
-            data = handler.parse()
-            
-            # Serialize points
-            serialized_points = []
-            for p in data['points']:
-                point_dict = p.copy()
-                if point_dict.get('time'):
-                    point_dict['time'] = point_dict['time'].isoformat()
-                serialized_points.append(point_dict)
-
-            return {
-                'filename': filename,
-                'total_distance': data['total_distance'],
-                'total_duration': data['total_duration'],
-                'point_count': len(data['points']),
-                'points': serialized_points
-            }
+            if use_gzip:
+                body = _gpx_details_gzip(str(filepath), st.st_mtime_ns, st.st_size)
+                headers['Content-Encoding'] = 'gzip'
+            else:
+                body = _gpx_details_json(str(filepath), st.st_mtime_ns, st.st_size)
+            return Response(content=body, media_type='application/json', headers=headers)
         except Exception as e:
             logger.error("Failed to parse GPX file %s: %s", filename, e)
             raise GPXParseError(filename, str(e))
 
+    @app.get("/api/gpx_files/{filename}/download")
+    async def download_gpx_file(filename: str) -> FileResponse:
+        """Downloads a GPX file.
+
+        FileResponse streams the file in chunks (or via zero-copy send
+        where the server supports it) and sets ETag and Last-Modified from
+        the stat result _resolve_gpx already took.
+        """
+        filepath, st = _resolve_gpx(filename)
+        return FileResponse(
+            filepath,
+            media_type='application/gpx+xml',
+            filename=filepath.name,
+            stat_result=st,
+        )
+
     @app.post("/api/start")
-    async def start_simulation(req: StartSimulationRequest):
+    async def start_simulation(req: StartSimulationRequest) -> Dict[str, Any]:
         """Starts the simulation."""
         simulator: Simulator = app.state.simulator
         
-        filepath = os.path.join(UPLOAD_FOLDER, req.filename)
-        if not os.path.exists(filepath):
-            raise ResourceNotFoundError('GPX file', req.filename)
+        filepath, _ = _resolve_gpx(req.filename)
 
         if not req.udids:
             raise ValidationError('No devices selected for simulation', field='udids')
 
-        # Parse GPX
+        # Parse GPX (cached per file version)
         try:
-            handler = GPXHandler(filepath)
-            gpx_data = handler.parse()
-            points = gpx_data['points']
-            original_duration = gpx_data['total_duration']
-            
-            speed_multiplier = req.speed
-            
-            # Recalculate speed if target_duration is provided
-            if req.target_duration is not None:
-                if req.target_duration > 0 and original_duration > 0:
-                    speed_multiplier = original_duration / req.target_duration
-                    logger.info("Calculated speed %.2f based on target duration %.2fs", 
-                                speed_multiplier, req.target_duration)
-
+            gpx_data = GPXHandler(str(filepath)).parse()
         except Exception as e:
             logger.error("Failed to parse GPX: %s", e)
             raise GPXParseError(req.filename, str(e))
 
+        speed_multiplier = req.speed
+        original_duration = gpx_data['total_duration']
+        target_duration = req.target_duration
+
+        # Recalculate speed if target_duration is provided
+        if target_duration and target_duration > 0 and original_duration > 0:
+            speed_multiplier = original_duration / target_duration
+            logger.info("Calculated speed %.2f based on target duration %.2fs", 
+                        speed_multiplier, target_duration)
+
         # Start simulation (Native Async Await!)
         await simulator.start(
-            points, req.udids, loop_track=req.loop, speed_multiplier=speed_multiplier
+            gpx_data, req.udids, loop_track=req.loop, speed_multiplier=speed_multiplier
         )
+        invalidate_status()
 
         return {
             'message': 'Simulation started',
@@ -357,23 +587,34 @@ def create_app() -> FastAPI:
         }
 
     @app.post("/api/stop")
-    async def stop_simulation():
+    async def stop_simulation() -> Dict[str, str]:
         """Stops the simulation."""
         simulator: Simulator = app.state.simulator
         await simulator.stop()
+        invalidate_status()
         return {'message': 'Simulation paused'}
 
     @app.post("/api/reset")
-    async def reset_simulation():
+    async def reset_simulation() -> Dict[str, str]:
         """Resets the simulation."""
         simulator: Simulator = app.state.simulator
         await simulator.reset()
+        invalidate_status()
         return {'message': 'Simulation reset and location cleared'}
 
     @app.get("/api/status")
-    async def get_status():
-        """Gets real-time simulation status (Fallback for polling)."""
-        simulator: Simulator = app.state.simulator
-        return simulator.status
+    async def get_status() -> Response:
+        """Gets real-time simulation status (Fallback for polling).
+
+        The encoded body is reused for STATUS_CACHE_TTL seconds, so any
+        number of polling clients cost one encode per interval.
+        """
+        nonlocal status_body, status_expires
+        now = time.monotonic()
+        if now >= status_expires:
+            simulator: Simulator = app.state.simulator
+            status_body = JSONResponse(content=simulator.status).body
+            status_expires = now + STATUS_CACHE_TTL
+        return Response(content=status_body, media_type='application/json')
 
     return app